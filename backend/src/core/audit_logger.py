@@ -16,6 +16,17 @@ import httpx
 
 logger = logging.getLogger(__name__)
 
+# Fixed fields stamped on every audit event
+EVENT_SOURCE = "1password-credential-broker"
+EVENT_VERSION = "1.0.0"
+
+# Transport-level failures worth retrying with backoff: timeouts, network
+# and protocol errors all derive from httpx.TransportError
+RETRYABLE_EXCEPTIONS = (httpx.TransportError,)
+
+# Upper bound on event posts in flight while draining the retry queue
+MAX_CONCURRENT_RETRIES = 10
+
 
 class EventOutcome(str, Enum):
     """Possible outcomes for credential access events."""
@@ -79,6 +90,10 @@ class AuditLogger:
         # HTTP client for async requests
         self.http_client: httpx.AsyncClient | None = None
 
+        # Append-mode descriptor for the local log, opened on first write
+        self._log_fd: int | None = None
+        self._log_fd_path: str | None = None
+
         # Check if Events API is configured
         self.events_api_enabled = bool(self.events_api_url and self.events_api_token)
 
@@ -114,6 +129,14 @@ class AuditLogger:
         if self.http_client:
             await self.http_client.aclose()
             self.http_client = None
+        self._close_log_fd()
+
+    def _close_log_fd(self):
+        """Close the cached local log file descriptor, if open."""
+        if self._log_fd is not None:
+            os.close(self._log_fd)
+            self._log_fd = None
+            self._log_fd_path = None
 
     def _create_event_payload(
         self,
@@ -145,8 +168,8 @@ class AuditLogger:
             "agent_id": agent_id,
             "resource": resource,
             "outcome": outcome,
-            "source": "1password-credential-broker",
-            "version": "1.0.0",
+            "source": EVENT_SOURCE,
+            "version": EVENT_VERSION,
         }
 
         if metadata:
@@ -188,7 +211,7 @@ class AuditLogger:
                 )
                 return False
 
-        except Exception as e:
+        except RETRYABLE_EXCEPTIONS as e:
             logger.error(f"Failed to post event to API: {e}")
 
             # Retry with exponential backoff
@@ -202,6 +225,25 @@ class AuditLogger:
 
             return False
 
+        except Exception as e:
+            logger.error(f"Failed to post event to API (not retrying): {e}")
+            return False
+
+    def _log_fd_is_stale(self) -> bool:
+        """
+        Check whether the cached descriptor no longer points at the log file.
+
+        Returns:
+            True if no descriptor is open, the log path changed, or the file
+            at the path was moved, deleted or replaced (e.g. by logrotate)
+        """
+        if self._log_fd is None or self._log_fd_path != self.local_log_file:
+            return True
+        try:
+            return os.fstat(self._log_fd).st_ino != os.stat(self.local_log_file).st_ino
+        except FileNotFoundError:
+            return True
+
     def _log_event_locally(self, event: dict[str, Any]):
         """
         Log event to local file as fallback.
@@ -213,8 +255,17 @@ class AuditLogger:
             return
 
         try:
-            with open(self.local_log_file, "a") as f:
-                f.write(json.dumps(event) + "\n")
+            # Reuse one O_APPEND descriptor instead of reopening per event,
+            # but reopen once the file is rotated away or replaced
+            if self._log_fd_is_stale():
+                self._close_log_fd()
+                self._log_fd = os.open(
+                    self.local_log_file,
+                    os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+                    0o640,
+                )
+                self._log_fd_path = self.local_log_file
+            os.write(self._log_fd, (json.dumps(event) + "\n").encode())
             logger.debug(f"Event logged locally: {event['event_type']}")
         except Exception as e:
             logger.error(f"Failed to log event locally: {e}")
@@ -361,21 +412,23 @@ class AuditLogger:
 
         logger.info(f"Retrying {len(self.failed_events_queue)} failed events...")
 
-        successful = 0
-        failed_again = []
+        # Drain the queue and post events concurrently, a bounded number at a time
+        events = list(self.failed_events_queue)
+        self.failed_events_queue.clear()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_RETRIES)
 
-        while self.failed_events_queue:
-            event = self.failed_events_queue.popleft()
-            success = await self._post_event_to_api(event)
+        async def post(event: dict[str, Any]) -> bool:
+            async with semaphore:
+                return await self._post_event_to_api(event)
 
-            if success:
-                successful += 1
-            else:
-                failed_again.append(event)
+        results = await asyncio.gather(*(post(event) for event in events))
 
-        # Re-queue events that failed again
-        for event in failed_again:
-            self.failed_events_queue.append(event)
+        # Re-queue events that failed again, preserving their order
+        failed_again = [
+            event for event, success in zip(events, results) if not success
+        ]
+        self.failed_events_queue.extend(failed_again)
+        successful = len(events) - len(failed_again)
 
         logger.info(
             f"Retry complete: {successful} succeeded, "
@@ -4,15 +4,25 @@ Real-time visualization of MCP, A2A, and ACP protocols with interactive testing.
 """
 
 import asyncio
+import concurrent.futures
+import csv
+import functools
+import heapq
+import io
+import itertools
 import json
 import os
 import sys
+import threading
+from collections import deque
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
 import httpx
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import streamlit as st
 
 # Add parent directory to path for imports
@@ -69,6 +79,73 @@ st.markdown(
 )
 
 
+# Protocols and outcomes offered by the dashboard filters
+PROTOCOLS = ("MCP", "A2A", "ACP")
+OUTCOMES = ("success", "failure", "error")
+
+# Number of audit events kept for display
+MAX_AUDIT_EVENTS = 100
+
+# Audit event fields, stored column-wise in session state
+AUDIT_FIELDS = ("timestamp", "protocol", "agent_id", "resource", "outcome", "metadata")
+
+# Arrow schema of the event stream table; protocol and outcome are low-cardinality
+AUDIT_SCHEMA = pa.schema(
+    [
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("protocol", pa.dictionary(pa.int8(), pa.string())),
+        ("agent_id", pa.string()),
+        ("resource", pa.string()),
+        ("outcome", pa.dictionary(pa.int8(), pa.string())),
+    ]
+)
+
+
+def new_audit_columns() -> dict[str, deque]:
+    """Create empty audit event columns, each a ring buffer of MAX_AUDIT_EVENTS."""
+    return {field: deque(maxlen=MAX_AUDIT_EVENTS) for field in AUDIT_FIELDS}
+
+
+# Static vault resource listings, built once at import
+VAULT_RESOURCE_SECTIONS = (
+    (
+        "🖥️ Servers",
+        """
+- **dev-server** (dev-login)
+- **staging-server** (stage-login)
+- **production-server** (prod-login)
+""",
+    ),
+    (
+        "🔌 APIs",
+        """
+- **aws-api**
+- **slack-api**
+- **github-api**
+- **stripe-api**
+- **test-api**
+""",
+    ),
+    (
+        "🗃️ Databases",
+        """
+- **dev-mysql** (demo-)
+- **staging-postgres** (dbuser)
+- **production-db** (dbuser)
+- **production-postgres** (test)
+- **test-database** (dbuser)
+""",
+    ),
+    (
+        "🔑 SSH & Generic",
+        """
+- **test-ssh** (SHA256:ms2+8dvzsl/sjzueHVDFAd/...)
+- **generic** (test)
+""",
+    ),
+)
+
+
 # Initialize session state
 def init_session_state():
     """Initialize Streamlit session state variables."""
@@ -77,42 +154,70 @@ def init_session_state():
     if "active_tokens" not in st.session_state:
         st.session_state.active_tokens = []
     if "protocol_counts" not in st.session_state:
-        st.session_state.protocol_counts = {"MCP": 0, "A2A": 0, "ACP": 0}
+        st.session_state.protocol_counts = dict.fromkeys(PROTOCOLS, 0)
     if "success_count" not in st.session_state:
         st.session_state.success_count = 0
     if "failure_count" not in st.session_state:
         st.session_state.failure_count = 0
-    if "audit_events" not in st.session_state:
-        st.session_state.audit_events = []
+    if "audit_columns" not in st.session_state:
+        st.session_state.audit_columns = new_audit_columns()
+    if "audit_version" not in st.session_state:
+        st.session_state.audit_version = 0
     if "last_token" not in st.session_state:
         st.session_state.last_token = None
     if "start_time" not in st.session_state:
         st.session_state.start_time = datetime.now(UTC)
+    if "token_counter" not in st.session_state:
+        st.session_state.token_counter = itertools.count(1)
+    if "token_seq" not in st.session_state:
+        st.session_state.token_seq = itertools.count()
 
 
 init_session_state()
 
 
 # Helper functions
-def get_time_remaining(expires_at: float) -> str:
-    """Calculate time remaining until expiration."""
+def get_times_remaining(expires_at: list[float]) -> list[str]:
+    """Calculate time remaining until each expiration, reading the clock once."""
     now = datetime.now(UTC).timestamp()
-    remaining = int(expires_at - now)
-    if remaining <= 0:
-        return "Expired"
-    minutes = remaining // 60
-    seconds = remaining % 60
-    return f"{minutes}m {seconds}s"
+    remaining = (np.asarray(expires_at, dtype=float) - now).astype(int)
+    minutes, seconds = np.divmod(remaining, 60)
+    return [
+        f"{m}m {s}s" if r > 0 else "Expired"
+        for r, m, s in zip(remaining.tolist(), minutes.tolist(), seconds.tolist())
+    ]
+
+
+@functools.lru_cache(maxsize=256)
+def token_label_prefix(index: int, protocol: str, resource: str) -> str:
+    """Static part of an active token's expander label."""
+    return f"Token {index} - {protocol} | {resource} | Expires: "
+
+
+def add_active_token(token_info: dict[str, Any]):
+    """
+    Track a token in the active tokens min-heap, keyed by expiry.
+
+    The session's token sequence breaks ties so heap entries never compare
+    token dicts.
+    """
+    heapq.heappush(
+        st.session_state.active_tokens,
+        (token_info["expires_at"], next(st.session_state.token_seq), token_info),
+    )
+
+
+def sorted_active_tokens() -> list[dict[str, Any]]:
+    """Return active tokens ordered by expiry, soonest first."""
+    return [token_info for _, _, token_info in sorted(st.session_state.active_tokens)]
 
 
 def clean_expired_tokens():
-    """Remove expired tokens from active tokens list."""
+    """Pop expired tokens off the active tokens heap."""
     now = datetime.now(UTC).timestamp()
-    st.session_state.active_tokens = [
-        token
-        for token in st.session_state.active_tokens
-        if token["expires_at"] > now
-    ]
+    heap = st.session_state.active_tokens
+    while heap and heap[0][0] <= now:
+        heapq.heappop(heap)
 
 
 def add_audit_event(
@@ -121,19 +226,137 @@ def add_audit_event(
     resource: str,
     outcome: str,
     metadata: dict[str, Any] | None = None,
+    timestamp: str | None = None,
 ):
-    """Add an audit event to the session state."""
+    """
+    Add an audit event to the session state.
+
+    Callers bump st.session_state.audit_version once after adding their
+    events, so a batch of events costs a single proxy write.
+
+    Args:
+        timestamp: Event timestamp (ISO format); defaults to now
+    """
     event = {
-        "timestamp": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
+        "timestamp": timestamp
+        or datetime.now(UTC).isoformat().replace("+00:00", "Z"),
         "protocol": protocol,
         "agent_id": agent_id,
         "resource": resource,
         "outcome": outcome,
         "metadata": metadata or {},
     }
-    st.session_state.audit_events.insert(0, event)  # Most recent first
-    # Keep only last 100 events
-    st.session_state.audit_events = st.session_state.audit_events[:100]
+    # Most recent first; the bounded deques drop the oldest event
+    for field, column in st.session_state.audit_columns.items():
+        column.appendleft(event[field])
+
+
+def category_mask(column: pd.Series, selected: list[str]) -> np.ndarray | None:
+    """
+    Build a row mask for a categorical column in one pass over its codes.
+
+    Selection is resolved once per category into a lookup table, which is
+    then indexed by the integer codes. A trailing False entry maps missing
+    values (code -1) to unselected.
+
+    Returns:
+        Boolean row mask, or None when every row is selected (the default
+        filter state) so callers can skip filtering
+    """
+    selected_categories = column.cat.categories.isin(selected)
+    if selected_categories.all() and not column.hasnans:
+        return None
+    lookup = np.append(selected_categories, False)
+    return lookup[column.cat.codes.to_numpy()]
+
+
+def audit_timestamp_array(timestamps: deque) -> pa.Array:
+    """
+    Convert ISO 8601 timestamp strings to the AUDIT_SCHEMA timestamp type.
+
+    Tries Arrow's strict cast first. If any string is naive, has nanosecond
+    precision or does not parse, falls back to pandas: naive times are taken
+    as UTC, extra precision is truncated and unparseable values become null.
+    """
+    timestamp_type = AUDIT_SCHEMA.field("timestamp").type
+    strings = pa.array(timestamps, pa.string())
+    try:
+        return strings.cast(timestamp_type)
+    except pa.ArrowInvalid:
+        parsed = pd.to_datetime(
+            pd.Series(timestamps, dtype=object),
+            utc=True,
+            format="ISO8601",
+            errors="coerce",
+        )
+        return pa.Array.from_pandas(parsed).cast(timestamp_type, safe=False)
+
+
+def build_audit_frame(audit_columns: dict[str, deque]) -> pd.DataFrame:
+    """Build the unfiltered audit event table from the audit columns."""
+    # Build a typed Arrow batch straight from the columns, skipping inference;
+    # dictionary columns become categoricals and strings stay Arrow-backed
+    batch = pa.RecordBatch.from_arrays(
+        [audit_timestamp_array(audit_columns["timestamp"])]
+        + [
+            pa.array(audit_columns[field.name], pa.string()).cast(field.type)
+            for field in AUDIT_SCHEMA
+            if field.name != "timestamp"
+        ],
+        schema=AUDIT_SCHEMA,
+    )
+    return batch.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+
+
+def get_audit_frame() -> pd.DataFrame:
+    """
+    Return the session's audit event table, reused across reruns.
+
+    The table is rebuilt only when events were added since it was last built
+    or the audit columns were reset.
+    """
+    audit_columns = st.session_state.audit_columns
+    version = st.session_state.audit_version
+    cached = st.session_state.get("audit_frame")
+    if cached is None or cached[0] is not audit_columns or cached[1] != version:
+        cached = (audit_columns, version, build_audit_frame(audit_columns))
+        st.session_state.audit_frame = cached
+    return cached[2]
+
+
+def filter_events(
+    events_df: pd.DataFrame,
+    protocols: list[str],
+    outcomes: list[str],
+    max_events: int,
+) -> pd.DataFrame:
+    """Filter the audit event table by protocol and outcome, most recent first."""
+    for name, selected in (("protocol", protocols), ("outcome", outcomes)):
+        mask = category_mask(events_df[name], selected)
+        if mask is not None:
+            events_df = events_df.loc[mask]
+
+    return events_df.head(max_events)
+
+
+def encode_csv(events_df: pd.DataFrame) -> bytes:
+    """
+    Encode an audit event table as CSV.
+
+    Writes the fixed AUDIT_SCHEMA columns with csv.writer, avoiding the
+    per-call overhead of DataFrame.to_csv for this small, known schema.
+    Missing values are written as empty fields, as to_csv does.
+    """
+    columns = [events_df["timestamp"].dt.strftime("%Y-%m-%d %H:%M:%S")]
+    columns += [events_df[name] for name in AUDIT_SCHEMA.names[1:]]
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(AUDIT_SCHEMA.names)
+    writer.writerows(
+        zip(*(column.astype(object).where(column.notna(), "").tolist() for column in columns))
+    )
+    return buffer.getvalue().encode()
 
 
 # Audit log reading functions
@@ -185,23 +408,31 @@ def read_audit_log_events(since_timestamp: str | None = None) -> list[dict[str,
     return events
 
 
-def update_metrics_from_audit_logs():
-    """Update dashboard metrics by reading audit logs."""
-    # Get the last processed timestamp
-    last_processed = st.session_state.get('last_audit_timestamp', None)
-    
-    # Read new events since last check
-    new_events = read_audit_log_events(since_timestamp=last_processed)
-    
-    if not new_events:
-        return
-    
-    # Update timestamp for next check
-    if new_events:
-        st.session_state.last_audit_timestamp = new_events[-1]['timestamp']
-    
-    # Process each new event
-    for event in new_events:
+def _apply_audit_events(
+    events: list[dict[str, Any]], min_expires_at: float | None = None
+):
+    """
+    Fold audit log events into the dashboard metrics.
+
+    Counters are accumulated in locals and written back to session state once,
+    since every session state assignment goes through Streamlit's proxy.
+    Likewise only the newest MAX_AUDIT_EVENTS events are collected for
+    display, and each audit column is rebuilt in a single assignment.
+
+    Args:
+        events: Parsed audit events, oldest first
+        min_expires_at: Only track tokens expiring after this timestamp
+    """
+    total = 0
+    succ = 0
+    fail = 0
+    pc = dict(st.session_state.protocol_counts)
+    token_counter = st.session_state.token_counter
+    new_tokens = []
+    recent = {field: [] for field in AUDIT_FIELDS}
+    recent_start = len(events) - MAX_AUDIT_EVENTS
+
+    for index, event in enumerate(events):
         protocol = event.get('protocol', '').upper()
         outcome = event.get('outcome', '')
         agent_id = event.get('agent_id', 'unknown')
@@ -209,19 +440,23 @@ def update_metrics_from_audit_logs():
         metadata = event.get('metadata', {})
         
         # Update counters
-        st.session_state.total_requests += 1
+        total += 1
         
-        if protocol in st.session_state.protocol_counts:
-            st.session_state.protocol_counts[protocol] += 1
+        if protocol in pc:
+            pc[protocol] += 1
         
         # Update success/failure counts
         if outcome in ['success']:
-            st.session_state.success_count += 1
+            succ += 1
             
             # Add to active tokens if it's a successful credential access
-            if event.get('event_type') == 'credential_access' and 'expires_at' in metadata:
+            if (event.get('event_type') == 'credential_access' and
+                'expires_at' in metadata and
+                (min_expires_at is None or
+                 metadata.get('expires_at', 0) > min_expires_at)):
+                
                 token_info = {
-                    "token": f"JWT_TOKEN_{len(st.session_state.active_tokens) + 1}",  # Placeholder
+                    "token": f"JWT_TOKEN_{next(token_counter)}",  # Placeholder
                     "protocol": protocol,
                     "resource": resource,
                     "agent_id": agent_id,
@@ -229,20 +464,61 @@ def update_metrics_from_audit_logs():
                     "expires_at": metadata.get('expires_at', 0),
                     "ttl_minutes": metadata.get('ttl_minutes', 5),
                 }
-                st.session_state.active_tokens.append(token_info)
+                new_tokens.append(token_info)
                 
         elif outcome in ['failure', 'error', 'denied']:
-            st.session_state.failure_count += 1
+            fail += 1
         
-        # Add to audit events for display
-        add_audit_event(
-            protocol=protocol,
-            agent_id=agent_id,
-            resource=resource,
-            outcome=outcome,
-            metadata=metadata
+        # Collect the newest events for display; older ones would be evicted
+        if index >= recent_start:
+            recent["timestamp"].append(
+                event.get('timestamp')
+                or datetime.now(UTC).isoformat().replace("+00:00", "Z")
+            )
+            recent["protocol"].append(protocol)
+            recent["agent_id"].append(agent_id)
+            recent["resource"].append(resource)
+            recent["outcome"].append(outcome)
+            recent["metadata"].append(metadata or {})
+
+    # Most recent first, ahead of the events already shown
+    audit_columns = st.session_state.audit_columns
+    for field, values in recent.items():
+        audit_columns[field] = deque(
+            itertools.islice(
+                itertools.chain(reversed(values), audit_columns[field]),
+                MAX_AUDIT_EVENTS,
+            ),
+            maxlen=MAX_AUDIT_EVENTS,
         )
 
+    st.session_state.total_requests += total
+    st.session_state.success_count += succ
+    st.session_state.failure_count += fail
+    st.session_state.protocol_counts = pc
+    st.session_state.audit_version += 1
+    for token_info in new_tokens:
+        add_active_token(token_info)
+
+
+def update_metrics_from_audit_logs():
+    """Update dashboard metrics by reading audit logs."""
+    # Get the last processed timestamp
+    last_processed = st.session_state.get('last_audit_timestamp', None)
+    
+    # Read new events since last check
+    new_events = read_audit_log_events(since_timestamp=last_processed)
+    
+    if not new_events:
+        return
+    
+    # Update timestamp for next check
+    if new_events:
+        st.session_state.last_audit_timestamp = new_events[-1]['timestamp']
+    
+    # Process each new event
+    _apply_audit_events(new_events)
+
 
 def initialize_audit_log_metrics():
     """Initialize metrics by reading all existing audit logs."""
@@ -252,57 +528,15 @@ def initialize_audit_log_metrics():
         
         # Reset counters
         st.session_state.total_requests = 0
-        st.session_state.protocol_counts = {"MCP": 0, "A2A": 0, "ACP": 0}
+        st.session_state.protocol_counts = dict.fromkeys(PROTOCOLS, 0)
         st.session_state.success_count = 0
         st.session_state.failure_count = 0
         st.session_state.active_tokens = []
-        st.session_state.audit_events = []
+        st.session_state.audit_columns = new_audit_columns()
+        st.session_state.token_counter = itertools.count(1)
         
-        # Process all events
-        for event in all_events:
-            protocol = event.get('protocol', '').upper()
-            outcome = event.get('outcome', '')
-            agent_id = event.get('agent_id', 'unknown')
-            resource = event.get('resource', 'unknown')
-            metadata = event.get('metadata', {})
-            
-            # Update counters
-            st.session_state.total_requests += 1
-            
-            if protocol in st.session_state.protocol_counts:
-                st.session_state.protocol_counts[protocol] += 1
-            
-            # Update success/failure counts
-            if outcome in ['success']:
-                st.session_state.success_count += 1
-                
-                # Add to active tokens if it's a successful credential access and not expired
-                if (event.get('event_type') == 'credential_access' and 
-                    'expires_at' in metadata and 
-                    metadata.get('expires_at', 0) > datetime.now(UTC).timestamp()):
-                    
-                    token_info = {
-                        "token": f"JWT_TOKEN_{len(st.session_state.active_tokens) + 1}",  # Placeholder
-                        "protocol": protocol,
-                        "resource": resource,
-                        "agent_id": agent_id,
-                        "issued_at": datetime.fromisoformat(event['timestamp'].replace('Z', '+00:00')).timestamp(),
-                        "expires_at": metadata.get('expires_at', 0),
-                        "ttl_minutes": metadata.get('ttl_minutes', 5),
-                    }
-                    st.session_state.active_tokens.append(token_info)
-                    
-            elif outcome in ['failure', 'error', 'denied']:
-                st.session_state.failure_count += 1
-            
-            # Add to audit events for display
-            add_audit_event(
-                protocol=protocol,
-                agent_id=agent_id,
-                resource=resource,
-                outcome=outcome,
-                metadata=metadata
-            )
+        # Process all events, skipping tokens that have already expired
+        _apply_audit_events(all_events, min_expires_at=datetime.now(UTC).timestamp())
         
         # Set the last processed timestamp
         if all_events:
@@ -311,8 +545,43 @@ def initialize_audit_log_metrics():
         st.session_state.audit_log_initialized = True
 
 
+# Background event loop for protocol tests
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Start a single event loop in a daemon thread, shared across reruns."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+
+@st.cache_resource
+def get_http_client() -> httpx.AsyncClient:
+    """Shared HTTP client for protocol tests, so connections are kept alive."""
+    return httpx.AsyncClient()
+
+
+def run_async(coro, timeout: float = 15.0) -> Any:
+    """
+    Run a coroutine on the background event loop and wait for its result.
+
+    The loop and its thread are shared by every browser session, so the
+    coroutine must not touch st.session_state; callers apply its result on
+    the script thread once this returns.
+
+    Raises:
+        TimeoutError: If the coroutine does not finish within timeout seconds;
+            it is cancelled so it cannot complete later
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise TimeoutError(f"No response within {timeout:.0f}s") from None
+
+
 # Test protocol functions
-async def test_mcp_protocol(resource_type: str, resource_name: str, agent_id: str):
+def test_mcp_protocol(resource_type: str, resource_name: str, agent_id: str):
     """Test MCP protocol by calling the credential manager directly."""
     try:
         # Initialize credential manager
@@ -345,7 +614,7 @@ async def test_mcp_protocol(resource_type: str, resource_name: str, agent_id: st
             ).timestamp(),
             "ttl_minutes": result["ttl_minutes"],
         }
-        st.session_state.active_tokens.append(token_info)
+        add_active_token(token_info)
         st.session_state.last_token = result["token"]
 
         # Add audit event
@@ -356,6 +625,7 @@ async def test_mcp_protocol(resource_type: str, resource_name: str, agent_id: st
             outcome="success",
             metadata={"ttl_minutes": result["ttl_minutes"]},
         )
+        st.session_state.audit_version += 1
 
         return {"success": True, "result": result}
 
@@ -372,78 +642,94 @@ async def test_mcp_protocol(resource_type: str, resource_name: str, agent_id: st
             outcome="error",
             metadata={"error": str(e)},
         )
+        st.session_state.audit_version += 1
 
         return {"success": False, "error": str(e)}
 
 
-async def test_a2a_protocol(
+async def request_a2a(
     capability_name: str, database_name: str, agent_id: str, duration_minutes: int = 5
-):
-    """Test A2A protocol via HTTP API."""
+) -> dict[str, Any]:
+    """
+    Send an A2A task to the server.
+
+    Runs on the background event loop, so it only returns a plain outcome
+    dict and leaves st.session_state to record_a2a_result.
+    """
     try:
         base_url = os.getenv("A2A_SERVER_URL", "http://localhost:8000")
         bearer_token = os.getenv(
             "A2A_BEARER_TOKEN", "dev-token-change-in-production"
         )
 
-        async with httpx.AsyncClient() as client:
-            # Make request to A2A server
-            response = await client.post(
-                f"{base_url}/task",
-                json={
-                    "task_id": f"task-{datetime.now(UTC).timestamp()}",
-                    "capability_name": capability_name,
-                    "parameters": {
-                        "database_name": database_name,
-                        "duration_minutes": duration_minutes,
-                    },
-                    "requesting_agent_id": agent_id,
+        client = get_http_client()
+
+        # Make request to A2A server
+        response = await client.post(
+            f"{base_url}/task",
+            json={
+                "task_id": f"task-{datetime.now(UTC).timestamp()}",
+                "capability_name": capability_name,
+                "parameters": {
+                    "database_name": database_name,
+                    "duration_minutes": duration_minutes,
                 },
-                headers={"Authorization": f"Bearer {bearer_token}"},
-                timeout=10.0,
-            )
+                "requesting_agent_id": agent_id,
+            },
+            headers={"Authorization": f"Bearer {bearer_token}"},
+            timeout=10.0,
+        )
 
-            if response.status_code == 200:
-                result = response.json()
+        if response.status_code == 200:
+            return {"success": True, "result": response.json()}
+        else:
+            raise Exception(f"HTTP {response.status_code}: {response.text}")
 
-                # Update metrics
-                st.session_state.total_requests += 1
-                st.session_state.protocol_counts["A2A"] += 1
-                st.session_state.success_count += 1
+    except Exception as e:
+        return {"success": False, "error": str(e)}
 
-                # Extract token from result
-                token = result["result"]["ephemeral_token"]
-                expires_in = result["result"]["expires_in_seconds"]
 
-                # Add token to active tokens
-                token_info = {
-                    "token": token,
-                    "protocol": "A2A",
-                    "resource": f"database/{database_name}",
-                    "agent_id": agent_id,
-                    "issued_at": datetime.now(UTC).timestamp(),
-                    "expires_at": datetime.now(UTC).timestamp() + expires_in,
-                    "ttl_minutes": duration_minutes,
-                }
-                st.session_state.active_tokens.append(token_info)
-                st.session_state.last_token = token
-
-                # Add audit event
-                add_audit_event(
-                    protocol="A2A",
-                    agent_id=agent_id,
-                    resource=f"database/{database_name}",
-                    outcome="success",
-                    metadata={"ttl_minutes": duration_minutes},
-                )
+def record_a2a_result(
+    outcome: dict[str, Any],
+    capability_name: str,
+    database_name: str,
+    agent_id: str,
+    duration_minutes: int = 5,
+) -> dict[str, Any]:
+    """Apply an A2A outcome to this session's metrics, tokens and audit stream."""
+    st.session_state.total_requests += 1
+    st.session_state.protocol_counts["A2A"] += 1
 
-                return {"success": True, "result": result}
-            else:
-                raise Exception(f"HTTP {response.status_code}: {response.text}")
+    if outcome["success"]:
+        st.session_state.success_count += 1
 
-    except Exception as e:
-        st.session_state.total_requests += 1
-        st.session_state.protocol_counts["A2A"] += 1
+        # Extract token from result
+        result = outcome["result"]
+        token = result["result"]["ephemeral_token"]
+        expires_in = result["result"]["expires_in_seconds"]
+
+        # Add token to active tokens
+        token_info = {
+            "token": token,
+            "protocol": "A2A",
+            "resource": f"database/{database_name}",
+            "agent_id": agent_id,
+            "issued_at": datetime.now(UTC).timestamp(),
+            "expires_at": datetime.now(UTC).timestamp() + expires_in,
+            "ttl_minutes": duration_minutes,
+        }
+        add_active_token(token_info)
+        st.session_state.last_token = token
+
+        # Add audit event
+        add_audit_event(
+            protocol="A2A",
+            agent_id=agent_id,
+            resource=f"database/{database_name}",
+            outcome="success",
+            metadata={"ttl_minutes": duration_minutes},
+        )
+    else:
         st.session_state.failure_count += 1
 
         # Add audit event
@@ -452,86 +738,112 @@ async def test_a2a_protocol(
             agent_id=agent_id,
             resource=f"database/{database_name}",
             outcome="error",
-            metadata={"error": str(e)},
+            metadata={"error": outcome["error"]},
         )
+    st.session_state.audit_version += 1
 
-        return {"success": False, "error": str(e)}
+    return outcome
 
 
-async def test_acp_protocol(agent_name: str, message: str, requester_id: str):
-    """Test ACP protocol via HTTP API."""
+def test_a2a_protocol(
+    capability_name: str, database_name: str, agent_id: str, duration_minutes: int = 5
+) -> dict[str, Any]:
+    """Test A2A protocol via HTTP API."""
+    args = (capability_name, database_name, agent_id, duration_minutes)
+    try:
+        outcome = run_async(request_a2a(*args))
+    except TimeoutError as e:
+        outcome = {"success": False, "error": str(e)}
+    return record_a2a_result(outcome, *args)
+
+
+async def request_acp(
+    agent_name: str, message: str, requester_id: str
+) -> dict[str, Any]:
+    """
+    Send a natural language run request to the ACP server.
+
+    Runs on the background event loop, so it only returns a plain outcome
+    dict and leaves st.session_state to record_acp_result.
+    """
     try:
         base_url = os.getenv("ACP_SERVER_URL", "http://localhost:8001")
         bearer_token = os.getenv(
             "ACP_BEARER_TOKEN", "dev-token-change-in-production"
         )
 
-        async with httpx.AsyncClient() as client:
-            # Make request to ACP server
-            response = await client.post(
-                f"{base_url}/run",
-                json={
-                    "agent_name": agent_name,
-                    "input": [
-                        {
-                            "parts": [
-                                {"content": message, "content_type": "text/plain"}
-                            ],
-                            "role": "user",
-                        }
-                    ],
-                },
-                headers={"Authorization": f"Bearer {bearer_token}"},
-                timeout=10.0,
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-
-                # Update metrics
-                st.session_state.total_requests += 1
-                st.session_state.protocol_counts["ACP"] += 1
-                st.session_state.success_count += 1
-
-                # Extract token from output if present
-                token = None
-                for output in result.get("output", []):
-                    for part in output.get("parts", []):
-                        if part.get("content_type") == "application/jwt":
-                            token = part["content"]
-                            break
-
-                if token:
-                    # Add token to active tokens
-                    token_info = {
-                        "token": token,
-                        "protocol": "ACP",
-                        "resource": "parsed_from_message",
-                        "agent_id": requester_id,
-                        "issued_at": datetime.now(UTC).timestamp(),
-                        "expires_at": datetime.now(UTC).timestamp()
-                        + 300,  # 5 minutes default
-                        "ttl_minutes": 5,
+        client = get_http_client()
+
+        # Make request to ACP server
+        response = await client.post(
+            f"{base_url}/run",
+            json={
+                "agent_name": agent_name,
+                "input": [
+                    {
+                        "parts": [
+                            {"content": message, "content_type": "text/plain"}
+                        ],
+                        "role": "user",
                     }
-                    st.session_state.active_tokens.append(token_info)
-                    st.session_state.last_token = token
-
-                # Add audit event
-                add_audit_event(
-                    protocol="ACP",
-                    agent_id=requester_id,
-                    resource="natural_language_request",
-                    outcome="success",
-                    metadata={"session_id": result.get("session_id")},
-                )
+                ],
+            },
+            headers={"Authorization": f"Bearer {bearer_token}"},
+            timeout=10.0,
+        )
 
-                return {"success": True, "result": result}
-            else:
-                raise Exception(f"HTTP {response.status_code}: {response.text}")
+        if response.status_code == 200:
+            return {"success": True, "result": response.json()}
+        else:
+            raise Exception(f"HTTP {response.status_code}: {response.text}")
 
     except Exception as e:
-        st.session_state.total_requests += 1
-        st.session_state.protocol_counts["ACP"] += 1
+        return {"success": False, "error": str(e)}
+
+
+def record_acp_result(
+    outcome: dict[str, Any], agent_name: str, message: str, requester_id: str
+) -> dict[str, Any]:
+    """Apply an ACP outcome to this session's metrics, tokens and audit stream."""
+    st.session_state.total_requests += 1
+    st.session_state.protocol_counts["ACP"] += 1
+
+    if outcome["success"]:
+        st.session_state.success_count += 1
+        result = outcome["result"]
+
+        # Extract token from output if present
+        token = None
+        for output in result.get("output", []):
+            for part in output.get("parts", []):
+                if part.get("content_type") == "application/jwt":
+                    token = part["content"]
+                    break
+
+        if token:
+            # Add token to active tokens
+            token_info = {
+                "token": token,
+                "protocol": "ACP",
+                "resource": "parsed_from_message",
+                "agent_id": requester_id,
+                "issued_at": datetime.now(UTC).timestamp(),
+                "expires_at": datetime.now(UTC).timestamp()
+                + 300,  # 5 minutes default
+                "ttl_minutes": 5,
+            }
+            add_active_token(token_info)
+            st.session_state.last_token = token
+
+        # Add audit event
+        add_audit_event(
+            protocol="ACP",
+            agent_id=requester_id,
+            resource="natural_language_request",
+            outcome="success",
+            metadata={"session_id": result.get("session_id")},
+        )
+    else:
         st.session_state.failure_count += 1
 
         # Add audit event
@@ -540,10 +852,231 @@ async def test_acp_protocol(agent_name: str, message: str, requester_id: str):
             agent_id=requester_id,
             resource="natural_language_request",
             outcome="error",
-            metadata={"error": str(e)},
+            metadata={"error": outcome["error"]},
         )
+    st.session_state.audit_version += 1
 
-        return {"success": False, "error": str(e)}
+    return outcome
+
+
+def test_acp_protocol(
+    agent_name: str, message: str, requester_id: str
+) -> dict[str, Any]:
+    """Test ACP protocol via HTTP API."""
+    args = (agent_name, message, requester_id)
+    try:
+        outcome = run_async(request_acp(*args))
+    except TimeoutError as e:
+        outcome = {"success": False, "error": str(e)}
+    return record_acp_result(outcome, *args)
+
+
+async def request_remote_protocols(
+    a2a_args: tuple, acp_args: tuple
+) -> list[dict[str, Any]]:
+    """Send the A2A and ACP requests concurrently and return both outcomes."""
+    return await asyncio.gather(request_a2a(*a2a_args), request_acp(*acp_args))
+
+
+def test_all_protocols(
+    mcp_args: tuple, a2a_args: tuple, acp_args: tuple
+) -> list[dict[str, Any]]:
+    """
+    Test all three protocols, overlapping the A2A and ACP HTTP round trips.
+
+    MCP calls the credential manager synchronously, so it runs on this thread
+    before the HTTP requests are gathered on the background event loop. Their
+    outcomes are recorded here on the script thread once the gather returns,
+    and a timeout is recorded as a failure of both. Results are in MCP, A2A,
+    ACP order.
+    """
+    mcp_result = test_mcp_protocol(*mcp_args)
+    try:
+        a2a_outcome, acp_outcome = run_async(
+            request_remote_protocols(a2a_args, acp_args)
+        )
+    except TimeoutError as e:
+        a2a_outcome = acp_outcome = {"success": False, "error": str(e)}
+    return [
+        mcp_result,
+        record_a2a_result(a2a_outcome, *a2a_args),
+        record_acp_result(acp_outcome, *acp_args),
+    ]
+
+
+# Live dashboard panels, rerun as fragments on the auto-refresh interval
+def render_metrics():
+    """Render the real-time metrics section."""
+    # Pull new audit log events; this is the first live panel on the page
+    update_metrics_from_audit_logs()
+    clean_expired_tokens()
+
+    st.header("📊 Real-Time Metrics")
+
+    # Calculate uptime
+    uptime = datetime.now(UTC) - st.session_state.start_time
+    uptime_str = str(uptime).split(".")[0]  # Remove microseconds
+
+    # Calculate success rate
+    total = st.session_state.total_requests
+    success_rate = (
+        (st.session_state.success_count / total * 100) if total > 0 else 0.0
+    )
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric(
+            label="Active Tokens",
+            value=len(st.session_state.active_tokens),
+            delta=None,
+        )
+
+    with col2:
+        st.metric(
+            label="Total Requests",
+            value=st.session_state.total_requests,
+            delta=None,
+        )
+
+    with col3:
+        st.metric(
+            label="Success Rate",
+            value=f"{success_rate:.1f}%",
+            delta=f"{st.session_state.success_count}/{total}",
+        )
+
+    with col4:
+        st.metric(label="Uptime", value=uptime_str, delta=None)
+
+
+def render_protocol_usage():
+    """Render the protocol usage section."""
+    st.header("📈 Protocol Usage")
+
+    total = st.session_state.total_requests
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        # Bar chart
+        protocol_df = pd.DataFrame(
+            {
+                "Protocol": PROTOCOLS,
+                "Requests": [
+                    st.session_state.protocol_counts[protocol]
+                    for protocol in PROTOCOLS
+                ],
+            }
+        )
+
+        st.bar_chart(protocol_df.set_index("Protocol"), width='stretch')
+
+    with col2:
+        st.subheader("Protocol Breakdown")
+        for protocol in PROTOCOLS:
+            count = st.session_state.protocol_counts[protocol]
+            percentage = (count / total * 100) if total > 0 else 0
+            st.metric(label=protocol, value=count, delta=f"{percentage:.1f}%")
+
+
+def render_live_panels():
+    """Render the active tokens and audit event stream sections."""
+    # Section 5: Active Tokens Display
+    st.header("🎟️ Active Tokens")
+
+    if st.session_state.active_tokens:
+        tokens = sorted_active_tokens()
+        times_left = get_times_remaining([t["expires_at"] for t in tokens])
+        for i, (token_info, time_left) in enumerate(zip(tokens, times_left)):
+            with st.expander(
+                token_label_prefix(i + 1, token_info["protocol"], token_info["resource"])
+                + time_left
+            ):
+                col1, col2 = st.columns([1, 3])
+
+                with col1:
+                    st.markdown("**Details:**")
+                    st.text(f"Protocol: {token_info['protocol']}")
+                    st.text(f"Resource: {token_info['resource']}")
+                    st.text(f"Agent: {token_info['agent_id']}")
+                    st.text(f"TTL: {token_info['ttl_minutes']} minutes")
+
+                    if time_left == "Expired":
+                        st.error(f"⏰ Status: {time_left}")
+                    else:
+                        st.success(f"⏰ Time Left: {time_left}")
+
+                with col2:
+                    st.markdown("**Token:**")
+                    st.code(token_info["token"], language=None)
+
+                    if st.button(f"📋 Copy Token {i+1}", key=f"copy_{i}"):
+                        st.info("Token copied to description above!")
+    else:
+        st.info("No active tokens. Test a protocol to generate credentials.")
+
+    st.markdown("---")
+
+    # Section 6: Audit Event Stream
+    st.header("📜 Audit Event Stream")
+
+    # Filter controls
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        protocol_filter = st.multiselect(
+            "Filter by Protocol",
+            PROTOCOLS,
+            default=PROTOCOLS,
+            key="audit_protocol_filter",
+        )
+
+    with col2:
+        outcome_filter = st.multiselect(
+            "Filter by Outcome",
+            OUTCOMES,
+            default=OUTCOMES,
+            key="audit_outcome_filter",
+        )
+
+    with col3:
+        max_events = st.number_input(
+            "Max Events", min_value=5, max_value=100, value=20, key="max_events"
+        )
+
+    # Display audit events
+    audit_columns = st.session_state.audit_columns
+    if audit_columns["timestamp"]:
+        events_df = filter_events(
+            get_audit_frame(), protocol_filter, outcome_filter, max_events
+        )
+
+        if not events_df.empty:
+            st.dataframe(
+                events_df,
+                width='stretch',
+                hide_index=True,
+                column_config={
+                    "timestamp": st.column_config.DatetimeColumn(
+                        format="YYYY-MM-DD HH:mm:ss"
+                    ),
+                },
+            )
+
+            # Download button; the CSV is only encoded when clicked
+            st.download_button(
+                label="📥 Download Audit Log (CSV)",
+                data=lambda: encode_csv(events_df),
+                file_name=f"audit_log_{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv",
+            )
+        else:
+            st.info("No events match the selected filters.")
+    else:
+        st.info(
+            "No audit events yet. Test a protocol to generate audit trail data."
+        )
 
 
 # Main dashboard
@@ -551,12 +1084,6 @@ def main():
     """Main dashboard rendering function."""
     # Initialize audit log metrics on first run
     initialize_audit_log_metrics()
-    
-    # Update metrics from audit logs
-    update_metrics_from_audit_logs()
-    
-    # Clean expired tokens
-    clean_expired_tokens()
 
     # Header
     st.title("🔐 Universal 1Password Credential Broker")
@@ -605,11 +1132,13 @@ def main():
         # Auto-refresh control
         st.subheader("🔄 Auto-Refresh")
         auto_refresh = st.checkbox("Enable auto-refresh", value=True)
+        run_every = None
         if auto_refresh:
             refresh_interval = st.slider(
                 "Refresh interval (seconds)", 1, 10, 3, key="refresh_interval"
             )
             st.markdown(f"Refreshing every **{refresh_interval}s**")
+            run_every = refresh_interval
 
         st.markdown("---")
 
@@ -617,12 +1146,13 @@ def main():
         if st.button("🔄 Reset All Metrics", width='stretch'):
             st.session_state.total_requests = 0
             st.session_state.active_tokens = []
-            st.session_state.protocol_counts = {"MCP": 0, "A2A": 0, "ACP": 0}
+            st.session_state.protocol_counts = dict.fromkeys(PROTOCOLS, 0)
             st.session_state.success_count = 0
             st.session_state.failure_count = 0
-            st.session_state.audit_events = []
+            st.session_state.audit_columns = new_audit_columns()
             st.session_state.last_token = None
             st.session_state.start_time = datetime.now(UTC)
+            st.session_state.token_counter = itertools.count(1)
             # Reset audit log tracking
             st.session_state.last_audit_timestamp = None
             st.session_state.audit_log_initialized = False
@@ -630,114 +1160,22 @@ def main():
 
     # Main content area
     # Section 1: Real-time Metrics
-    st.header("📊 Real-Time Metrics")
-
-    # Calculate uptime
-    uptime = datetime.now(UTC) - st.session_state.start_time
-    uptime_str = str(uptime).split(".")[0]  # Remove microseconds
-
-    # Calculate success rate
-    total = st.session_state.total_requests
-    success_rate = (
-        (st.session_state.success_count / total * 100) if total > 0 else 0.0
-    )
-
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        st.metric(
-            label="Active Tokens",
-            value=len(st.session_state.active_tokens),
-            delta=None,
-        )
-
-    with col2:
-        st.metric(
-            label="Total Requests",
-            value=st.session_state.total_requests,
-            delta=None,
-        )
-
-    with col3:
-        st.metric(
-            label="Success Rate",
-            value=f"{success_rate:.1f}%",
-            delta=f"{st.session_state.success_count}/{total}",
-        )
-
-    with col4:
-        st.metric(label="Uptime", value=uptime_str, delta=None)
+    st.fragment(render_metrics, run_every=run_every)()
 
     st.markdown("---")
 
     # Section 2: Available Vault Resources
     st.header("🗄️ Available 1Password Vault Resources")
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.subheader("🖥️ Servers")
-        st.markdown("""
-        - **dev-server** (dev-login)
-        - **staging-server** (stage-login)
-        - **production-server** (prod-login)
-        """)
-    
-    with col2:
-        st.subheader("🔌 APIs")
-        st.markdown("""
-        - **aws-api**
-        - **slack-api**
-        - **github-api**
-        - **stripe-api**
-        - **test-api**
-        """)
-    
-    with col3:
-        st.subheader("🗃️ Databases")
-        st.markdown("""
-        - **dev-mysql** (demo-)
-        - **staging-postgres** (dbuser)
-        - **production-db** (dbuser)
-        - **production-postgres** (test)
-        - **test-database** (dbuser)
-        """)
-    
-    with col4:
-        st.subheader("🔑 SSH & Generic")
-        st.markdown("""
-        - **test-ssh** (SHA256:ms2+8dvzsl/sjzueHVDFAd/...)
-        - **generic** (test)
-        """)
+    for col, (title, resources_md) in zip(st.columns(4), VAULT_RESOURCE_SECTIONS):
+        with col:
+            st.subheader(title)
+            st.markdown(resources_md)
 
     st.markdown("---")
 
     # Section 3: Protocol Usage Visualization
-    st.header("📈 Protocol Usage")
-
-    col1, col2 = st.columns([2, 1])
-
-    with col1:
-        # Bar chart
-        protocol_df = pd.DataFrame(
-            {
-                "Protocol": ["MCP", "A2A", "ACP"],
-                "Requests": [
-                    st.session_state.protocol_counts["MCP"],
-                    st.session_state.protocol_counts["A2A"],
-                    st.session_state.protocol_counts["ACP"],
-                ],
-            }
-        )
-
-        st.bar_chart(protocol_df.set_index("Protocol"), width='stretch')
-
-    with col2:
-        st.subheader("Protocol Breakdown")
-        for protocol in ["MCP", "A2A", "ACP"]:
-            count = st.session_state.protocol_counts[protocol]
-            percentage = (count / total * 100) if total > 0 else 0
-            st.metric(label=protocol, value=count, delta=f"{percentage:.1f}%")
+    st.fragment(render_protocol_usage, run_every=run_every)()
 
     st.markdown("---")
 
@@ -802,9 +1240,7 @@ def main():
 
         if st.button("🚀 Test MCP Protocol", width='stretch', key="test_mcp"):
             with st.spinner("Requesting credentials via MCP..."):
-                result = asyncio.run(
-                    test_mcp_protocol(resource_type, resource_name, agent_id)
-                )
+                result = test_mcp_protocol(resource_type, resource_name, agent_id)
 
                 if result["success"]:
                     st.success("✅ MCP request successful!")
@@ -849,10 +1285,8 @@ def main():
 
         if st.button("🚀 Test A2A Protocol", width='stretch', key="test_a2a"):
             with st.spinner("Requesting credentials via A2A..."):
-                result = asyncio.run(
-                    test_a2a_protocol(
-                        capability, database_name, a2a_agent_id, duration
-                    )
+                result = test_a2a_protocol(
+                    capability, database_name, a2a_agent_id, duration
                 )
 
                 if result["success"]:
@@ -891,7 +1325,7 @@ def main():
 
         if st.button("🚀 Test ACP Protocol", width='stretch', key="test_acp"):
             with st.spinner("Requesting credentials via ACP..."):
-                result = asyncio.run(test_acp_protocol(agent_name, message, acp_requester))
+                result = test_acp_protocol(agent_name, message, acp_requester)
 
                 if result["success"]:
                     st.success("✅ ACP request successful!")
@@ -899,121 +1333,24 @@ def main():
                 else:
                     st.error(f"❌ ACP request failed: {result['error']}")
 
-    st.markdown("---")
-
-    # Section 5: Active Tokens Display
-    st.header("🎟️ Active Tokens")
-
-    if st.session_state.active_tokens:
-        for i, token_info in enumerate(st.session_state.active_tokens):
-            with st.expander(
-                f"Token {i+1} - {token_info['protocol']} | {token_info['resource']} | "
-                f"Expires: {get_time_remaining(token_info['expires_at'])}"
-            ):
-                col1, col2 = st.columns([1, 3])
-
-                with col1:
-                    st.markdown("**Details:**")
-                    st.text(f"Protocol: {token_info['protocol']}")
-                    st.text(f"Resource: {token_info['resource']}")
-                    st.text(f"Agent: {token_info['agent_id']}")
-                    st.text(f"TTL: {token_info['ttl_minutes']} minutes")
-
-                    time_left = get_time_remaining(token_info["expires_at"])
-                    if time_left == "Expired":
-                        st.error(f"⏰ Status: {time_left}")
-                    else:
-                        st.success(f"⏰ Time Left: {time_left}")
-
-                with col2:
-                    st.markdown("**Token:**")
-                    st.code(token_info["token"], language=None)
-
-                    if st.button(f"📋 Copy Token {i+1}", key=f"copy_{i}"):
-                        st.info("Token copied to description above!")
-    else:
-        st.info("No active tokens. Test a protocol to generate credentials.")
-
-    st.markdown("---")
-
-    # Section 6: Audit Event Stream
-    st.header("📜 Audit Event Stream")
-
-    # Filter controls
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        protocol_filter = st.multiselect(
-            "Filter by Protocol",
-            ["MCP", "A2A", "ACP"],
-            default=["MCP", "A2A", "ACP"],
-            key="audit_protocol_filter",
-        )
-
-    with col2:
-        outcome_filter = st.multiselect(
-            "Filter by Outcome",
-            ["success", "failure", "error"],
-            default=["success", "failure", "error"],
-            key="audit_outcome_filter",
-        )
-
-    with col3:
-        max_events = st.number_input(
-            "Max Events", min_value=5, max_value=100, value=20, key="max_events"
-        )
-
-    # Display audit events
-    if st.session_state.audit_events:
-        # Filter events
-        filtered_events = [
-            event
-            for event in st.session_state.audit_events
-            if event["protocol"] in protocol_filter
-            and event["outcome"] in outcome_filter
-        ][:max_events]
-
-        if filtered_events:
-            # Convert to DataFrame for better display
-            events_df = pd.DataFrame(filtered_events)
-
-            # Format timestamp
-            if "timestamp" in events_df.columns:
-                events_df["timestamp"] = pd.to_datetime(
-                    events_df["timestamp"]
-                ).dt.strftime("%Y-%m-%d %H:%M:%S")
-
-            # Reorder columns
-            columns = ["timestamp", "protocol", "agent_id", "resource", "outcome"]
-            events_df = events_df[columns]
-
-            st.dataframe(
-                events_df,
-                width='stretch',
-                hide_index=True,
+    if st.button("🚀 Test All Protocols", width='stretch', key="test_all"):
+        with st.spinner("Requesting credentials via MCP, A2A and ACP..."):
+            results = test_all_protocols(
+                (resource_type, resource_name, agent_id),
+                (capability, database_name, a2a_agent_id, duration),
+                (agent_name, message, acp_requester),
             )
 
-            # Download button
-            csv = events_df.to_csv(index=False)
-            st.download_button(
-                label="📥 Download Audit Log (CSV)",
-                data=csv,
-                file_name=f"audit_log_{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv",
-            )
-        else:
-            st.info("No events match the selected filters.")
-    else:
-        st.info(
-            "No audit events yet. Test a protocol to generate audit trail data."
-        )
+            for protocol, result in zip(PROTOCOLS, results):
+                if result["success"]:
+                    st.success(f"✅ {protocol} request successful!")
+                else:
+                    st.error(f"❌ {protocol} request failed: {result['error']}")
 
-    # Auto-refresh
-    if auto_refresh:
-        import time
+    st.markdown("---")
 
-        time.sleep(refresh_interval)
-        st.rerun()
+    # Sections 5 & 6: Active Tokens and Audit Event Stream
+    st.fragment(render_live_panels, run_every=run_every)()
 
 
 if __name__ == "__main__":
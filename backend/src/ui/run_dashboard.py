@@ -9,6 +9,37 @@ import subprocess
 import sys
 from pathlib import Path
 
+# Streamlit config options, keyed the way the CLI passes them as flags
+STREAMLIT_FLAGS = {
+    "server_port": 8501,
+    "server_address": "0.0.0.0",
+    "server_headless": True,
+    "browser_gatherUsageStats": False,
+}
+
+
+def run_streamlit(dashboard_path: Path):
+    """
+    Serve the dashboard with Streamlit.
+
+    Uses Streamlit's bootstrap API in this process, avoiding a second Python
+    interpreter and the CLI layer. Falls back to the ``streamlit run``
+    command when Streamlit can't be imported here.
+    """
+    try:
+        from streamlit.web import bootstrap
+    except ImportError:
+        cmd = ["streamlit", "run", str(dashboard_path)]
+        cmd += [
+            f"--{name.replace('_', '.')}={str(value).lower()}"
+            for name, value in STREAMLIT_FLAGS.items()
+        ]
+        subprocess.run(cmd)
+        return
+
+    bootstrap.load_config_options(flag_options=STREAMLIT_FLAGS)
+    bootstrap.run(str(dashboard_path), False, [], STREAMLIT_FLAGS)
+
 
 def main():
     """Run the Streamlit dashboard."""
@@ -26,17 +57,6 @@ def main():
         print("Please copy .env.example to .env and configure it.")
         print("")
 
-    # Streamlit command
-    cmd = [
-        "streamlit",
-        "run",
-        str(dashboard_path),
-        "--server.port=8501",
-        "--server.address=0.0.0.0",
-        "--server.headless=true",
-        "--browser.gatherUsageStats=false",
-    ]
-
     print("=" * 60)
     print("  1Password Credential Broker Dashboard")
     print("=" * 60)
@@ -48,7 +68,7 @@ def main():
     print("")
 
     try:
-        subprocess.run(cmd)
+        run_streamlit(dashboard_path)
     except KeyboardInterrupt:
         print("\n\nDashboard stopped.")
     except FileNotFoundError:
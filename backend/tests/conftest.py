@@ -2,21 +2,53 @@
 Shared pytest fixtures and configuration
 """
 
+import os
+
 import pytest
 
+# Environment shared by the server test modules; A2A_BEARER_TOKEN is read when
+# src.a2a.a2a_server is imported, so the a2a fixture also sets it around that import.
+SERVER_TEST_ENV = {
+    "OP_CONNECT_HOST": "http://localhost:8080",
+    "OP_CONNECT_TOKEN": "test-token-for-testing",
+    "OP_VAULT_ID": "test-vault-123",
+    "JWT_SECRET_KEY": "test_secret_key_at_least_32_characters_long",
+    "A2A_BEARER_TOKEN": "dev-token-change-in-production",
+}
+
+
+@pytest.fixture(scope="module")
+def _env():
+    """Set the server environment variables once for a test module.
+
+    Opt in with ``pytestmark = pytest.mark.usefixtures("_env")``; the variables
+    are restored afterwards so tests for missing configuration still see a
+    clean environment.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        for name, value in SERVER_TEST_ENV.items():
+            mp.setenv(name, value)
+        yield
+
 
 @pytest.fixture(scope="session")
-def test_env_vars(monkeypatch_session):
+def test_env_vars():
     """Set up test environment variables for the entire session."""
-    monkeypatch_session.setenv("OP_CONNECT_HOST", "http://localhost:8080")
-    monkeypatch_session.setenv("OP_CONNECT_TOKEN", "test-token-for-testing")
-    monkeypatch_session.setenv("OP_VAULT_ID", "test-vault-123")
-    monkeypatch_session.setenv(
-        "JWT_SECRET_KEY", "test_secret_key_at_least_32_characters_long"
+    saved_env = os.environ.copy()
+    os.environ.update(
+        {
+            "OP_CONNECT_HOST": "http://localhost:8080",
+            "OP_CONNECT_TOKEN": "test-token-for-testing",
+            "OP_VAULT_ID": "test-vault-123",
+            "JWT_SECRET_KEY": "test_secret_key_at_least_32_characters_long",
+            "JWT_ALGORITHM": "HS256",
+            "TOKEN_TTL_MINUTES": "5",
+            "LOG_LEVEL": "DEBUG",
+        }
     )
-    monkeypatch_session.setenv("JWT_ALGORITHM", "HS256")
-    monkeypatch_session.setenv("TOKEN_TTL_MINUTES", "5")
-    monkeypatch_session.setenv("LOG_LEVEL", "DEBUG")
+    yield
+    os.environ.clear()
+    os.environ.update(saved_env)
 
 
 @pytest.fixture
@@ -35,19 +67,12 @@ def temp_dir(tmp_path):
     return tmp_path
 
 
-@pytest.fixture(scope="session")
-def monkeypatch_session():
-    """Session-scoped monkeypatch fixture."""
-    from _pytest.monkeypatch import MonkeyPatch
-
-    m = MonkeyPatch()
-    yield m
-    m.undo()
-
-
 # Pytest configuration
 def pytest_configure(config):
     """Configure pytest with custom markers."""
     config.addinivalue_line("markers", "asyncio: mark test as an async test")
     config.addinivalue_line("markers", "integration: mark test as an integration test")
     config.addinivalue_line("markers", "slow: mark test as slow running")
+    config.addinivalue_line(
+        "markers", "benchmark: mark test as a benchmark (run with -n0 -m benchmark)"
+    )
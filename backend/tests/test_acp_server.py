@@ -2,108 +2,230 @@
 Unit tests for ACP Server
 """
 
-import os
-import sys
+import copy
+import importlib.util
+import random
 
-# Environment variables will be set in fixtures to avoid test pollution
+# Environment variables are set once per module by the _env fixture in conftest.py;
+# src.acp.acp_server is imported lazily by the session-scoped acp fixture
 
 import pytest
-from unittest.mock import AsyncMock, Mock, patch, MagicMock
-from datetime import datetime, timezone, UTC
-from fastapi.testclient import TestClient
-import uuid
+from unittest.mock import AsyncMock, Mock
+import httpx
+import pytest_asyncio
+from types import SimpleNamespace
 
+pytestmark = pytest.mark.usefixtures("_env")
 
-@pytest.fixture(autouse=True)
-def setup_test_env(monkeypatch):
-    """Set up test environment variables for all ACP server tests."""
-    monkeypatch.setenv("OP_CONNECT_HOST", "http://localhost:8080")
-    monkeypatch.setenv("OP_CONNECT_TOKEN", "test-token-for-testing")
-    monkeypatch.setenv("OP_VAULT_ID", "test-vault-123")
-    monkeypatch.setenv("JWT_SECRET_KEY", "test_secret_key_at_least_32_characters_long")
 
-from src.acp.acp_server import (
-    app,
-    IntentParser,
-    SessionManager,
-    MessagePart,
-    Message,
-    ACPRunRequest,
-    ACPRunResponse,
-    RunStatus,
-    AgentInfo,
-    AgentsResponse,
-    SessionHistory,
-    HealthResponse,
-)
+@pytest.fixture(scope="session")
+def acp():
+    """Import the ACP server module on first use rather than at collection."""
+    import src.acp.acp_server as module
+
+    return module
 
 
 # Test client for FastAPI
-@pytest.fixture
-def client():
-    """Create a test client for the ACP server."""
-    return TestClient(app)
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def aclient(_env, acp):
+    """Create an async HTTP client for the ACP server, shared across the module.
+
+    Requests go straight to the app through ASGITransport, without
+    TestClient's thread portal. ASGITransport does not run the app lifespan,
+    so no real credential manager or 1Password health check is built; tests
+    install mock components with patched_acp. A first /health request warms
+    routing and response validation before the tests run.
+    """
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=acp.app), base_url="http://test"
+    ) as c:
+        await c.get("/health")
+        yield c
+
+
+# Tests never rely on session ID uniqueness
+_STATIC_SESSION_ID = "session-00000000-0000-0000-0000-000000000000"
+
+# Mocks don't care about timestamp freshness, so one string serves every payload
+_FROZEN_TS = "2024-01-01T00:00:00+00:00"
+
+# Mock templates are built once at import; the fixtures reset them and hand
+# each test shallow copies of the canned return payloads.
+_TOKEN_RESULT = {
+    "token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.test_token",
+    "expires_in": 300,
+    "resource": "database/test-db",
+    "issued_at": _FROZEN_TS,
+    "expires_at": _FROZEN_TS,
+    "ttl_minutes": 5,
+}
+_HEALTH_RESULT = {
+    "status": "healthy",
+    "components": {
+        "onepassword": {"status": "healthy"},
+        "token_manager": {"status": "healthy"},
+    }
+}
+_SESSION_RECORD = {
+    "session_id": "test-session-123",
+    "created_at": _FROZEN_TS,
+    "last_activity": _FROZEN_TS,
+    "interactions": [
+        {
+            "timestamp": _FROZEN_TS,
+            "run_id": "run-123",
+            "input_summary": "I need database credentials",
+            "output_summary": "Generated ephemeral credentials",
+            "status": "completed",
+        }
+    ],
+}
+
+_CRED_TEMPLATE = Mock()
+_CRED_TEMPLATE.fetch_and_issue_token = Mock()
+_CRED_TEMPLATE.health_check = Mock()
+
+# The audit logger only needs its one coroutine, so skip Mock's attribute machinery
+_AUDIT_TEMPLATE = SimpleNamespace(log_credential_access=AsyncMock())
+
+_SESSION_TEMPLATE = Mock()
+_SESSION_TEMPLATE.create_session = AsyncMock()
+_SESSION_TEMPLATE.add_interaction = AsyncMock()
+_SESSION_TEMPLATE.get_session = AsyncMock()
+
+
+def _reset_template(template, **return_values):
+    """Clear recorded calls on a mock template and restore its return values."""
+    template.reset_mock(return_value=True, side_effect=True)
+    for name, value in return_values.items():
+        getattr(template, name).return_value = copy.copy(value)
+    return template
+
+
+def _build_run_payload(content, agent_name="credential-broker", session_id=None):
+    """Build a /run request body with a single plain-text user message.
+
+    Pass ``agent_name=None`` to omit the agent name.
+    """
+    payload = {
+        "input": [
+            {
+                "parts": [{"content": content, "content_type": "text/plain"}],
+                "role": "user"
+            }
+        ]
+    }
+    if agent_name is not None:
+        payload["agent_name"] = agent_name
+    if session_id is not None:
+        payload["session_id"] = session_id
+    return payload
 
 
 @pytest.fixture
 def mock_credential_manager():
     """Mock credential manager for testing."""
-    mock = Mock()
-    mock.fetch_and_issue_token = Mock(return_value={
-        "token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.test_token",
-        "expires_in": 300,
-        "resource": "database/test-db",
-        "issued_at": datetime.now(UTC).isoformat() + "Z",
-        "expires_at": datetime.now(UTC).isoformat() + "Z",
-        "ttl_minutes": 5,
-    })
-    mock.health_check = Mock(return_value={
-        "status": "healthy",
-        "components": {
-            "onepassword": {"status": "healthy"},
-            "token_manager": {"status": "healthy"},
-        }
-    })
-    return mock
+    return _reset_template(
+        _CRED_TEMPLATE,
+        fetch_and_issue_token=_TOKEN_RESULT,
+        health_check=_HEALTH_RESULT,
+    )
 
 
 @pytest.fixture
 def mock_audit_logger():
     """Mock audit logger for testing."""
-    mock = Mock()
-    mock.log_credential_access = AsyncMock()
-    return mock
+    _AUDIT_TEMPLATE.log_credential_access.reset_mock(return_value=True, side_effect=True)
+    return _AUDIT_TEMPLATE
 
 
 @pytest.fixture
 def mock_session_manager():
     """Mock session manager for testing."""
-    mock = Mock()
-    mock.create_session = AsyncMock(return_value=f"session-{uuid.uuid4()}")
-    mock.add_interaction = AsyncMock()
-    mock.get_session = AsyncMock(return_value={
-        "session_id": "test-session-123",
-        "created_at": datetime.now(UTC).isoformat() + "Z",
-        "last_activity": datetime.now(UTC).isoformat() + "Z",
-        "interactions": [
-            {
-                "timestamp": datetime.now(UTC).isoformat() + "Z",
-                "run_id": "run-123",
-                "input_summary": "I need database credentials",
-                "output_summary": "Generated ephemeral credentials",
-                "status": "completed",
-            }
-        ],
-    })
-    return mock
+    return _reset_template(
+        _SESSION_TEMPLATE,
+        create_session=_STATIC_SESSION_ID,
+        get_session=_SESSION_RECORD,
+    )
+
+
+@pytest.fixture(scope="session")
+def user_msg(acp):
+    """User message list shared by the add_interaction tests, which only read it."""
+    return [
+        acp.Message(
+            parts=[acp.MessagePart(content="test", content_type="text/plain")],
+            role="user"
+        )
+    ]
+
+
+@pytest.fixture(scope="session")
+def assist_msg(acp):
+    """Assistant message list shared by the add_interaction tests."""
+    return [
+        acp.Message(
+            parts=[acp.MessagePart(content="response", content_type="text/plain")],
+            role="assistant"
+        )
+    ]
+
+
+@pytest.fixture(scope="session")
+def parse(acp):
+    """IntentParser.parse_intent, returning a fresh result dict per call."""
+    return acp.IntentParser.parse_intent
+
+
+@pytest.fixture(params=[10, 100, 1000])
+def parse_inputs(request):
+    """Seeded batch of (resource_type, resource_name, text) parser requests."""
+    rng = random.Random(42)
+    resource_types = ["database", "api", "ssh"]
+    inputs = []
+    for i in range(request.param):
+        resource_type = rng.choice(resource_types)
+        inputs.append(
+            (resource_type, f"res-{i}", f"I need {resource_type} credentials for res-{i}")
+        )
+    return inputs
+
+
+@pytest.fixture(scope="module")
+def _shared_session_manager(acp):
+    """SessionManager built once for the module; see session_manager."""
+    return acp.SessionManager()
+
+
+@pytest.fixture
+def session_manager(_shared_session_manager):
+    """Shared SessionManager with its sessions cleared for each test."""
+    _shared_session_manager.sessions.clear()
+    return _shared_session_manager
+
+
+@pytest.fixture
+def patched_acp(
+    monkeypatch, acp, mock_credential_manager, mock_audit_logger, mock_session_manager
+):
+    """Install the template mocks as the ACP server's module-level components."""
+    monkeypatch.setattr(acp, "credential_manager", mock_credential_manager)
+    monkeypatch.setattr(acp, "audit_logger", mock_audit_logger)
+    monkeypatch.setattr(acp, "session_manager", mock_session_manager)
+    return SimpleNamespace(
+        cred=mock_credential_manager,
+        audit=mock_audit_logger,
+        session=mock_session_manager,
+    )
 
 
 class TestHealthEndpoint:
     """Tests for health check endpoint."""
     
-    def test_health_check(self, client):
+    async def test_health_check(self, aclient):
         """Test health check endpoint returns healthy status."""
-        response = client.get("/health")
+        response = await aclient.get("/health")
         
         assert response.status_code == 200
         data = response.json()
@@ -117,9 +239,9 @@ class TestHealthEndpoint:
 class TestAgentDiscovery:
     """Tests for agent discovery endpoint."""
     
-    def test_get_agents(self, client):
+    async def test_get_agents(self, aclient):
         """Test agents endpoint returns agent list."""
-        response = client.get("/agents")
+        response = await aclient.get("/agents")
         
         assert response.status_code == 200
         data = response.json()
@@ -136,9 +258,9 @@ class TestAgentDiscovery:
         assert "version" in agent
         assert agent["version"] == "1.0.0"
     
-    def test_agent_capabilities(self, client):
+    async def test_agent_capabilities(self, aclient):
         """Test that agent has expected capabilities."""
-        response = client.get("/agents")
+        response = await aclient.get("/agents")
         data = response.json()
         
         agent = data["agents"][0]
@@ -160,80 +282,64 @@ class TestAgentDiscovery:
 class TestRunEndpoint:
     """Tests for run endpoint."""
     
-    def test_run_requires_agent_name(self, client):
+    async def test_run_requires_agent_name(self, aclient):
         """Test that run endpoint requires agent_name."""
-        response = client.post(
-            "/run",
-            json={
-                "input": [
-                    {
-                        "parts": [{"content": "test", "content_type": "text/plain"}],
-                        "role": "user"
-                    }
-                ]
-            }
+        response = await aclient.post(
+            "/run", json=_build_run_payload("test", agent_name=None)
         )
         
         assert response.status_code == 422  # Validation error
     
-    def test_run_unknown_agent(self, client):
+    async def test_run_unknown_agent(self, aclient):
         """Test that unknown agent returns 404."""
-        response = client.post(
-            "/run",
-            json={
-                "agent_name": "nonexistent-agent",
-                "input": [
-                    {
-                        "parts": [{"content": "test", "content_type": "text/plain"}],
-                        "role": "user"
-                    }
-                ]
-            }
+        response = await aclient.post(
+            "/run", json=_build_run_payload("test", agent_name="nonexistent-agent")
         )
         
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
     
-    @patch("src.acp.acp_server.credential_manager")
-    @patch("src.acp.acp_server.audit_logger")
-    @patch("src.acp.acp_server.session_manager")
-    def test_run_database_credentials(
-        self, mock_session, mock_audit, mock_cred_manager, client
+    @pytest.mark.parametrize(
+        "resource_type,resource_name,content,ttl",
+        [
+            (
+                "database",
+                "prod-postgres",
+                "I need database credentials for prod-postgres",
+                5,
+            ),
+            (
+                "api",
+                "stripe-api",
+                "Get API credentials for stripe-api for 10 minutes",
+                10,
+            ),
+            (
+                "ssh",
+                "production-server",
+                "I need SSH keys for production-server",
+                5,
+            ),
+        ],
+        ids=["database", "api_with_duration", "ssh"],
+    )
+    async def test_run_credentials(
+        self, aclient, patched_acp,
+        resource_type, resource_name, content, ttl
     ):
-        """Test successful database credentials request."""
+        """Test successful credential requests parsed from natural language."""
         # Setup mocks
-        session_id = f"session-{uuid.uuid4()}"
-        mock_session.create_session = AsyncMock(return_value=session_id)
-        mock_session.add_interaction = AsyncMock()
-        
-        mock_cred_manager.fetch_and_issue_token.return_value = {
+        patched_acp.cred.fetch_and_issue_token.return_value = {
             "token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.test_token",
-            "expires_in": 300,
-            "resource": "database/prod-postgres",
-            "issued_at": datetime.now(UTC).isoformat() + "Z",
-            "expires_at": datetime.now(UTC).isoformat() + "Z",
-            "ttl_minutes": 5,
+            "expires_in": ttl * 60,
+            "resource": f"{resource_type}/{resource_name}",
+            "issued_at": _FROZEN_TS,
+            "expires_at": _FROZEN_TS,
+            "ttl_minutes": ttl,
         }
-        mock_audit.log_credential_access = AsyncMock()
         
         # Make request
-        response = client.post(
-            "/run",
-            json={
-                "agent_name": "credential-broker",
-                "input": [
-                    {
-                        "parts": [
-                            {
-                                "content": "I need database credentials for prod-postgres",
-                                "content_type": "text/plain"
-                            }
-                        ],
-                        "role": "user"
-                    }
-                ]
-            }
-        )
+        response = await aclient.post("/run", json=_build_run_payload(content))
         
         assert response.status_code == 200
         data = response.json()
@@ -250,160 +356,43 @@ class TestRunEndpoint:
         output = data["output"][0]
         assert len(output["parts"]) == 2  # Text + JWT
         
-        # Verify credential manager was called with correct params
-        mock_cred_manager.fetch_and_issue_token.assert_called_once()
-        call_kwargs = mock_cred_manager.fetch_and_issue_token.call_args[1]
-        assert call_kwargs["resource_type"] == "database"
-        assert call_kwargs["resource_name"] == "prod-postgres"
+        # Verify credential manager was called with the parsed request
+        patched_acp.cred.fetch_and_issue_token.assert_called_once()
+        call_kwargs = patched_acp.cred.fetch_and_issue_token.call_args[1]
+        assert call_kwargs["resource_type"] == resource_type
+        assert call_kwargs["resource_name"] == resource_name
+        assert call_kwargs["ttl_minutes"] == ttl
         
         # Verify session was created and interaction logged
-        mock_session.create_session.assert_called_once()
-        mock_session.add_interaction.assert_called_once()
+        patched_acp.session.create_session.assert_called_once()
+        patched_acp.session.add_interaction.assert_called_once()
         
         # Verify audit logging
-        mock_audit.log_credential_access.assert_called_once()
-    
-    @patch("src.acp.acp_server.credential_manager")
-    @patch("src.acp.acp_server.audit_logger")
-    @patch("src.acp.acp_server.session_manager")
-    def test_run_api_credentials_with_duration(
-        self, mock_session, mock_audit, mock_cred_manager, client
-    ):
-        """Test API credentials request with custom duration."""
-        # Setup mocks
-        session_id = f"session-{uuid.uuid4()}"
-        mock_session.create_session = AsyncMock(return_value=session_id)
-        mock_session.add_interaction = AsyncMock()
-        
-        mock_cred_manager.fetch_and_issue_token.return_value = {
-            "token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.test_token",
-            "expires_in": 600,  # 10 minutes
-            "resource": "api/stripe-api",
-            "issued_at": datetime.now(UTC).isoformat() + "Z",
-            "expires_at": datetime.now(UTC).isoformat() + "Z",
-            "ttl_minutes": 10,
-        }
-        mock_audit.log_credential_access = AsyncMock()
-        
-        # Make request with duration specified
-        response = client.post(
-            "/run",
-            json={
-                "agent_name": "credential-broker",
-                "input": [
-                    {
-                        "parts": [
-                            {
-                                "content": "Get API credentials for stripe-api for 10 minutes",
-                                "content_type": "text/plain"
-                            }
-                        ],
-                        "role": "user"
-                    }
-                ]
-            }
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "completed"
-        
-        # Verify duration was parsed correctly
-        call_kwargs = mock_cred_manager.fetch_and_issue_token.call_args[1]
-        assert call_kwargs["ttl_minutes"] == 10
-        assert call_kwargs["resource_type"] == "api"
-        assert call_kwargs["resource_name"] == "stripe-api"
-    
-    @patch("src.acp.acp_server.credential_manager")
-    @patch("src.acp.acp_server.audit_logger")
-    @patch("src.acp.acp_server.session_manager")
-    def test_run_ssh_credentials(
-        self, mock_session, mock_audit, mock_cred_manager, client
-    ):
-        """Test SSH credentials request."""
-        # Setup mocks
-        session_id = f"session-{uuid.uuid4()}"
-        mock_session.create_session = AsyncMock(return_value=session_id)
-        mock_session.add_interaction = AsyncMock()
-        
-        mock_cred_manager.fetch_and_issue_token.return_value = {
-            "token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.test_token",
-            "expires_in": 300,
-            "resource": "ssh/production-server",
-            "issued_at": datetime.now(UTC).isoformat() + "Z",
-            "expires_at": datetime.now(UTC).isoformat() + "Z",
-            "ttl_minutes": 5,
-        }
-        mock_audit.log_credential_access = AsyncMock()
-        
-        # Make request
-        response = client.post(
-            "/run",
-            json={
-                "agent_name": "credential-broker",
-                "input": [
-                    {
-                        "parts": [
-                            {
-                                "content": "I need SSH keys for production-server",
-                                "content_type": "text/plain"
-                            }
-                        ],
-                        "role": "user"
-                    }
-                ]
-            }
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "completed"
-        
-        # Verify SSH resource type
-        call_kwargs = mock_cred_manager.fetch_and_issue_token.call_args[1]
-        assert call_kwargs["resource_type"] == "ssh"
-        assert call_kwargs["resource_name"] == "production-server"
+        patched_acp.audit.log_credential_access.assert_called_once()
     
-    @patch("src.acp.acp_server.credential_manager")
-    @patch("src.acp.acp_server.audit_logger")
-    @patch("src.acp.acp_server.session_manager")
-    def test_run_with_existing_session(
-        self, mock_session, mock_audit, mock_cred_manager, client
+    async def test_run_with_existing_session(
+        self, aclient, patched_acp
     ):
         """Test run with existing session ID."""
         # Setup mocks
         session_id = "existing-session-123"
-        mock_session.create_session = AsyncMock(return_value=session_id)
-        mock_session.add_interaction = AsyncMock()
+        patched_acp.session.create_session.return_value = session_id
         
-        mock_cred_manager.fetch_and_issue_token.return_value = {
+        patched_acp.cred.fetch_and_issue_token.return_value = {
             "token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.test_token",
             "expires_in": 300,
             "resource": "database/test-db",
-            "issued_at": datetime.now(UTC).isoformat() + "Z",
-            "expires_at": datetime.now(UTC).isoformat() + "Z",
+            "issued_at": _FROZEN_TS,
+            "expires_at": _FROZEN_TS,
             "ttl_minutes": 5,
         }
-        mock_audit.log_credential_access = AsyncMock()
         
         # Make request with session_id
-        response = client.post(
+        response = await aclient.post(
             "/run",
-            json={
-                "agent_name": "credential-broker",
-                "input": [
-                    {
-                        "parts": [
-                            {
-                                "content": "database credentials for test-db",
-                                "content_type": "text/plain"
-                            }
-                        ],
-                        "role": "user"
-                    }
-                ],
-                "session_id": session_id
-            }
+            json=_build_run_payload(
+                "database credentials for test-db", session_id=session_id
+            ),
         )
         
         assert response.status_code == 200
@@ -411,39 +400,16 @@ class TestRunEndpoint:
         assert data["session_id"] == session_id
         
         # Verify session was created with provided ID
-        mock_session.create_session.assert_called_once()
-        assert mock_session.create_session.call_args[0][0] == session_id
+        patched_acp.session.create_session.assert_called_once()
+        assert patched_acp.session.create_session.call_args[0][0] == session_id
     
-    @patch("src.acp.acp_server.credential_manager")
-    @patch("src.acp.acp_server.audit_logger")
-    @patch("src.acp.acp_server.session_manager")
-    def test_run_unparseable_request(
-        self, mock_session, mock_audit, mock_cred_manager, client
+    async def test_run_unparseable_request(
+        self, aclient, patched_acp
     ):
         """Test that unparseable request returns error status."""
-        # Setup mocks
-        session_id = f"session-{uuid.uuid4()}"
-        mock_session.create_session = AsyncMock(return_value=session_id)
-        mock_session.add_interaction = AsyncMock()
-        mock_audit.log_credential_access = AsyncMock()
-        
         # Make unparseable request
-        response = client.post(
-            "/run",
-            json={
-                "agent_name": "credential-broker",
-                "input": [
-                    {
-                        "parts": [
-                            {
-                                "content": "Hello, how are you today?",
-                                "content_type": "text/plain"
-                            }
-                        ],
-                        "role": "user"
-                    }
-                ]
-            }
+        response = await aclient.post(
+            "/run", json=_build_run_payload("Hello, how are you today?")
         )
         
         assert response.status_code == 200
@@ -456,43 +422,21 @@ class TestRunEndpoint:
         assert "couldn't understand" in data["output"][0]["parts"][0]["content"].lower()
         
         # Verify interaction was logged
-        mock_session.add_interaction.assert_called_once()
+        patched_acp.session.add_interaction.assert_called_once()
     
-    @patch("src.acp.acp_server.credential_manager")
-    @patch("src.acp.acp_server.audit_logger")
-    @patch("src.acp.acp_server.session_manager")
-    def test_run_credential_fetch_error(
-        self, mock_session, mock_audit, mock_cred_manager, client
+    async def test_run_credential_fetch_error(
+        self, aclient, patched_acp
     ):
         """Test that credential fetch errors are handled gracefully."""
-        # Setup mocks
-        session_id = f"session-{uuid.uuid4()}"
-        mock_session.create_session = AsyncMock(return_value=session_id)
-        mock_session.add_interaction = AsyncMock()
-        mock_audit.log_credential_access = AsyncMock()
-        
         # Make credential manager raise error
-        mock_cred_manager.fetch_and_issue_token.side_effect = Exception(
+        patched_acp.cred.fetch_and_issue_token.side_effect = Exception(
             "Resource not found in vault"
         )
         
         # Make request
-        response = client.post(
+        response = await aclient.post(
             "/run",
-            json={
-                "agent_name": "credential-broker",
-                "input": [
-                    {
-                        "parts": [
-                            {
-                                "content": "I need database credentials for nonexistent-db",
-                                "content_type": "text/plain"
-                            }
-                        ],
-                        "role": "user"
-                    }
-                ]
-            }
+            json=_build_run_payload("I need database credentials for nonexistent-db"),
         )
         
         assert response.status_code == 200
@@ -504,37 +448,35 @@ class TestRunEndpoint:
         assert "Resource not found" in data["output"][0]["parts"][0]["content"]
         
         # Verify audit logging for failure
-        mock_audit.log_credential_access.assert_called_once()
-        call_kwargs = mock_audit.log_credential_access.call_args[1]
+        patched_acp.audit.log_credential_access.assert_called_once()
+        call_kwargs = patched_acp.audit.log_credential_access.call_args[1]
         assert call_kwargs["outcome"] == "error"
     
-    def test_run_empty_input(self, client):
+    async def test_run_empty_input(self, aclient, patched_acp):
         """Test that empty input returns error."""
-        with patch('src.acp.acp_server.session_manager') as mock_session_manager:
-            mock_session_manager.create_session.return_value = "test-session-123"
-            
-            response = client.post(
-                "/run",
-                json={
-                    "agent_name": "credential-broker",
-                    "run_id": "run-fad7c847-edc9-40ed-a086-c28c293a07c9",
-                    "messages": []
-                }
-            )
-            
-            # Should get validation error
-            assert response.status_code == 422
+        patched_acp.session.create_session.return_value = "test-session-123"
+        
+        response = await aclient.post(
+            "/run",
+            json={
+                "agent_name": "credential-broker",
+                "run_id": "run-fad7c847-edc9-40ed-a086-c28c293a07c9",
+                "messages": []
+            }
+        )
+        
+        # Should get validation error
+        assert response.status_code == 422
 
 
 class TestSessionHistory:
     """Tests for session history endpoint."""
     
-    @patch("src.acp.acp_server.session_manager")
-    def test_get_session_history(self, mock_session, client):
+    async def test_get_session_history(self, aclient, patched_acp):
         """Test retrieving session history."""
         # Setup mock
         session_id = "test-session-123"
-        mock_session.get_session = AsyncMock(return_value={
+        patched_acp.session.get_session.return_value = {
             "session_id": session_id,
             "created_at": "2025-01-01T00:00:00Z",
             "last_activity": "2025-01-01T00:10:00Z",
@@ -554,10 +496,10 @@ class TestSessionHistory:
                     "status": "completed",
                 },
             ],
-        })
+        }
         
         # Make request
-        response = client.get(f"/sessions/{session_id}")
+        response = await aclient.get(f"/sessions/{session_id}")
         
         assert response.status_code == 200
         data = response.json()
@@ -581,14 +523,13 @@ class TestSessionHistory:
         assert "output_summary" in interaction
         assert "status" in interaction
     
-    @patch("src.acp.acp_server.session_manager")
-    def test_get_nonexistent_session(self, mock_session, client):
+    async def test_get_nonexistent_session(self, aclient, patched_acp):
         """Test that nonexistent session returns 404."""
         # Setup mock to return None
-        mock_session.get_session = AsyncMock(return_value=None)
+        patched_acp.session.get_session.return_value = None
         
         # Make request
-        response = client.get("/sessions/nonexistent-session-id")
+        response = await aclient.get("/sessions/nonexistent-session-id")
         
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
@@ -597,230 +538,212 @@ class TestSessionHistory:
 class TestIntentParser:
     """Tests for IntentParser class."""
     
-    def test_parse_database_credentials(self):
+    def test_parse_database_credentials(self, parse):
         """Test parsing database credential request."""
         text = "I need database credentials for production-postgres"
-        result = IntentParser.parse_intent(text)
+        result = parse(text)
         
         assert result["resource_type"] == "database"
         assert result["resource_name"] == "production-postgres"
         assert result["duration_minutes"] == 5  # Default
     
-    def test_parse_database_credentials_variations(self):
-        """Test various database request formats."""
-        variations = [
+    @pytest.mark.parametrize(
+        "text",
+        [
             "database credentials for prod-db",
             "db creds for test-database",
             "credentials for database my-postgres",
             "need my-db database",
-        ]
-        
-        for text in variations:
-            result = IntentParser.parse_intent(text)
-            assert result["resource_type"] == "database"
-            assert result["resource_name"] is not None
+        ],
+    )
+    def test_parse_database_credentials_variations(self, parse, text):
+        """Test various database request formats."""
+        result = parse(text)
+        assert result["resource_type"] == "database"
+        assert result["resource_name"] is not None
     
-    def test_parse_api_credentials(self):
+    def test_parse_api_credentials(self, parse):
         """Test parsing API credential request."""
         text = "Get API credentials for stripe-api"
-        result = IntentParser.parse_intent(text)
+        result = parse(text)
         
         assert result["resource_type"] == "api"
         assert result["resource_name"] == "stripe-api"
     
-    def test_parse_ssh_credentials(self):
+    def test_parse_ssh_credentials(self, parse):
         """Test parsing SSH credential request."""
         text = "I need SSH keys for production-server"
-        result = IntentParser.parse_intent(text)
+        result = parse(text)
         
         assert result["resource_type"] == "ssh"
         assert result["resource_name"] == "production-server"
     
-    def test_parse_with_duration(self):
+    def test_parse_with_duration(self, parse):
         """Test parsing request with duration."""
         text = "Get database credentials for test-db for 10 minutes"
-        result = IntentParser.parse_intent(text)
+        result = parse(text)
         
         assert result["duration_minutes"] == 10
     
-    def test_parse_duration_variations(self):
-        """Test parsing various duration formats."""
-        test_cases = [
+    @pytest.mark.parametrize(
+        "text,expected_duration",
+        [
             ("credentials for db for 5 minutes", 5),
             ("get creds for 15 mins", 15),
             ("need access for 1 minute", 1),
             ("credentials for 10 min", 10),
-        ]
-        
-        for text, expected_duration in test_cases:
-            result = IntentParser.parse_intent(text)
-            assert result["duration_minutes"] == expected_duration
+        ],
+    )
+    def test_parse_duration_variations(self, parse, text, expected_duration):
+        """Test parsing various duration formats."""
+        result = parse(text)
+        assert result["duration_minutes"] == expected_duration
     
-    def test_parse_duration_capped_at_15(self):
+    def test_parse_duration_capped_at_15(self, parse):
         """Test that duration is capped at 15 minutes."""
         text = "Get credentials for 100 minutes"
-        result = IntentParser.parse_intent(text)
+        result = parse(text)
         
         assert result["duration_minutes"] == 15  # Capped at max
     
-    def test_parse_generic_fallback(self):
+    def test_parse_generic_fallback(self, parse):
         """Test that unparseable requests fall back to generic."""
         text = "credentials for my-secret"
-        result = IntentParser.parse_intent(text)
+        result = parse(text)
         
         assert result["resource_type"] == "generic"
         assert result["resource_name"] == "my-secret"
     
-    def test_parse_no_resource_name(self):
+    def test_parse_no_resource_name(self, parse):
         """Test that completely unparseable text returns None for resource_name."""
         text = "Hello, how are you?"
-        result = IntentParser.parse_intent(text)
+        result = parse(text)
         
         assert result["resource_name"] is None
     
-    def test_parse_original_text_preserved(self):
+    def test_parse_original_text_preserved(self, parse):
         """Test that original text is preserved in result."""
         text = "I need database credentials for test-db"
-        result = IntentParser.parse_intent(text)
+        result = parse(text)
         
         assert result["original_text"] == text
 
+    def test_parse_bulk(self, acp, parse_inputs):
+        """Test parsing a seeded batch of generated requests."""
+        for resource_type, resource_name, text in parse_inputs:
+            result = acp.IntentParser.parse_intent(text)
+            assert result["resource_type"] == resource_type
+            assert result["resource_name"] == resource_name
+    
+    @pytest.mark.benchmark
+    @pytest.mark.skipif(
+        importlib.util.find_spec("pytest_benchmark") is None,
+        reason="pytest-benchmark is not installed",
+    )
+    def test_parse_bulk_benchmark(self, acp, parse_inputs, benchmark):
+        """Benchmark parsing a seeded batch of generated requests.
+
+        Deselected by default; xdist disables pytest-benchmark, so run it
+        serially with ``pytest -n0 -m benchmark``.
+        """
+        benchmark(
+            lambda: [acp.IntentParser.parse_intent(text) for _, _, text in parse_inputs]
+        )
+
 
 class TestSessionManager:
     """Tests for SessionManager class."""
     
-    @pytest.mark.asyncio
-    async def test_create_session(self):
+    async def test_create_session(self, session_manager):
         """Test creating a new session."""
-        manager = SessionManager()
         
-        session_id = await manager.create_session()
+        session_id = await session_manager.create_session()
         
         assert session_id is not None
         assert session_id.startswith("session-")
-        assert session_id in manager.sessions
+        assert session_id in session_manager.sessions
     
-    @pytest.mark.asyncio
-    async def test_create_session_with_id(self):
+    async def test_create_session_with_id(self, session_manager):
         """Test creating session with provided ID."""
-        manager = SessionManager()
         custom_id = "custom-session-123"
         
-        session_id = await manager.create_session(custom_id)
+        session_id = await session_manager.create_session(custom_id)
         
         assert session_id == custom_id
-        assert session_id in manager.sessions
+        assert session_id in session_manager.sessions
     
-    @pytest.mark.asyncio
-    async def test_create_session_existing_id(self):
+    async def test_create_session_existing_id(self, session_manager):
         """Test that existing session ID returns same session."""
-        manager = SessionManager()
         custom_id = "existing-session"
         
         # Create first time
-        session_id1 = await manager.create_session(custom_id)
+        session_id1 = await session_manager.create_session(custom_id)
         
         # Create again with same ID
-        session_id2 = await manager.create_session(custom_id)
+        session_id2 = await session_manager.create_session(custom_id)
         
         assert session_id1 == session_id2
-        assert len(manager.sessions) == 1
+        assert len(session_manager.sessions) == 1
     
-    @pytest.mark.asyncio
-    async def test_add_interaction(self):
+    async def test_add_interaction(self, acp, session_manager, user_msg, assist_msg):
         """Test adding interaction to session."""
-        manager = SessionManager()
-        session_id = await manager.create_session()
-        
-        input_messages = [
-            Message(
-                parts=[MessagePart(content="test input", content_type="text/plain")],
-                role="user"
-            )
-        ]
-        output_messages = [
-            Message(
-                parts=[MessagePart(content="test output", content_type="text/plain")],
-                role="assistant"
-            )
-        ]
+        session_id = await session_manager.create_session()
         
-        await manager.add_interaction(
+        await session_manager.add_interaction(
             session_id=session_id,
             run_id="run-123",
-            input_messages=input_messages,
-            output_messages=output_messages,
-            status=RunStatus.COMPLETED,
+            input_messages=user_msg,
+            output_messages=assist_msg,
+            status=acp.RunStatus.COMPLETED,
         )
         
         # Verify interaction was added
-        session = manager.sessions[session_id]
+        session = session_manager.sessions[session_id]
         assert len(session["interactions"]) == 1
         assert session["interactions"][0]["run_id"] == "run-123"
         assert session["interactions"][0]["status"] == "completed"
     
-    @pytest.mark.asyncio
-    async def test_add_interaction_creates_session(self):
+    async def test_add_interaction_creates_session(
+        self, acp, session_manager, user_msg, assist_msg
+    ):
         """Test that adding interaction to nonexistent session creates it."""
-        manager = SessionManager()
         new_session_id = "new-session-456"
         
-        input_messages = [
-            Message(
-                parts=[MessagePart(content="test", content_type="text/plain")],
-                role="user"
-            )
-        ]
-        output_messages = [
-            Message(
-                parts=[MessagePart(content="response", content_type="text/plain")],
-                role="assistant"
-            )
-        ]
-        
-        await manager.add_interaction(
+        await session_manager.add_interaction(
             session_id=new_session_id,
             run_id="run-999",
-            input_messages=input_messages,
-            output_messages=output_messages,
-            status=RunStatus.COMPLETED,
+            input_messages=user_msg,
+            output_messages=assist_msg,
+            status=acp.RunStatus.COMPLETED,
         )
         
         # Session should have been created
-        assert new_session_id in manager.sessions
-        assert len(manager.sessions[new_session_id]["interactions"]) == 1
+        assert new_session_id in session_manager.sessions
+        assert len(session_manager.sessions[new_session_id]["interactions"]) == 1
     
-    @pytest.mark.asyncio
-    async def test_get_session(self):
+    async def test_get_session(self, session_manager):
         """Test retrieving session."""
-        manager = SessionManager()
-        session_id = await manager.create_session()
+        session_id = await session_manager.create_session()
         
-        session = await manager.get_session(session_id)
+        session = await session_manager.get_session(session_id)
         
         assert session is not None
         assert session["session_id"] == session_id
         assert "created_at" in session
         assert "interactions" in session
     
-    @pytest.mark.asyncio
-    async def test_get_nonexistent_session(self):
+    async def test_get_nonexistent_session(self, session_manager):
         """Test retrieving nonexistent session returns None."""
-        manager = SessionManager()
-        
-        session = await manager.get_session("nonexistent")
+        session = await session_manager.get_session("nonexistent")
         
         assert session is None
     
-    @pytest.mark.asyncio
-    async def test_extract_summary(self):
+    async def test_extract_summary(self, acp, session_manager):
         """Test summary extraction from messages."""
-        manager = SessionManager()
-        
         messages = [
-            Message(
+            acp.Message(
                 parts=[
-                    MessagePart(
+                    acp.MessagePart(
                         content="This is a long message that should be truncated because it exceeds the 100 character limit for summaries and we want to make sure it works correctly",
                         content_type="text/plain"
                     )
@@ -829,54 +752,45 @@ class TestSessionManager:
             )
         ]
         
-        summary = manager._extract_summary(messages)
+        summary = session_manager._extract_summary(messages)
         
         assert len(summary) <= 103  # 100 + "..."
         assert summary.endswith("...")
     
-    @pytest.mark.asyncio
-    async def test_extract_summary_short_message(self):
+    async def test_extract_summary_short_message(self, acp, session_manager):
         """Test summary extraction for short message."""
-        manager = SessionManager()
-        
         messages = [
-            Message(
+            acp.Message(
                 parts=[
-                    MessagePart(content="Short message", content_type="text/plain")
+                    acp.MessagePart(content="Short message", content_type="text/plain")
                 ],
                 role="user"
             )
         ]
         
-        summary = manager._extract_summary(messages)
+        summary = session_manager._extract_summary(messages)
         
         assert summary == "Short message"
         assert not summary.endswith("...")
     
-    @pytest.mark.asyncio
-    async def test_extract_summary_empty_messages(self):
+    async def test_extract_summary_empty_messages(self, session_manager):
         """Test summary extraction for empty messages."""
-        manager = SessionManager()
-        
-        summary = manager._extract_summary([])
+        summary = session_manager._extract_summary([])
         
         assert summary == ""
     
-    @pytest.mark.asyncio
-    async def test_extract_summary_no_text_content(self):
+    async def test_extract_summary_no_text_content(self, acp, session_manager):
         """Test summary extraction when no text content."""
-        manager = SessionManager()
-        
         messages = [
-            Message(
+            acp.Message(
                 parts=[
-                    MessagePart(content="token123", content_type="application/jwt")
+                    acp.MessagePart(content="token123", content_type="application/jwt")
                 ],
                 role="assistant"
             )
         ]
         
-        summary = manager._extract_summary(messages)
+        summary = session_manager._extract_summary(messages)
         
         assert summary == "No text content"
 
@@ -884,9 +798,9 @@ class TestSessionManager:
 class TestPydanticModels:
     """Tests for Pydantic models."""
     
-    def test_message_part_model(self):
+    def test_message_part_model(self, acp):
         """Test MessagePart model."""
-        part = MessagePart(
+        part = acp.MessagePart(
             content="test content",
             content_type="text/plain"
         )
@@ -894,11 +808,11 @@ class TestPydanticModels:
         assert part.content == "test content"
         assert part.content_type == "text/plain"
     
-    def test_message_model(self):
+    def test_message_model(self, acp):
         """Test Message model."""
-        message = Message(
+        message = acp.Message(
             parts=[
-                MessagePart(content="test", content_type="text/plain")
+                acp.MessagePart(content="test", content_type="text/plain")
             ],
             role="user"
         )
@@ -907,13 +821,13 @@ class TestPydanticModels:
         assert message.role == "user"
         assert message.error is None
     
-    def test_acp_run_request_model(self):
+    def test_acp_run_request_model(self, acp):
         """Test ACPRunRequest model."""
-        request = ACPRunRequest(
+        request = acp.ACPRunRequest(
             agent_name="credential-broker",
             input=[
-                Message(
-                    parts=[MessagePart(content="test", content_type="text/plain")],
+                acp.Message(
+                    parts=[acp.MessagePart(content="test", content_type="text/plain")],
                     role="user"
                 )
             ]
@@ -923,16 +837,16 @@ class TestPydanticModels:
         assert len(request.input) == 1
         assert request.session_id is None
     
-    def test_acp_run_response_model(self):
+    def test_acp_run_response_model(self, acp):
         """Test ACPRunResponse model."""
-        response = ACPRunResponse(
+        response = acp.ACPRunResponse(
             run_id="run-123",
             agent_name="credential-broker",
             session_id="session-456",
-            status=RunStatus.COMPLETED,
+            status=acp.RunStatus.COMPLETED,
             output=[
-                Message(
-                    parts=[MessagePart(content="result", content_type="text/plain")],
+                acp.Message(
+                    parts=[acp.MessagePart(content="result", content_type="text/plain")],
                     role="assistant"
                 )
             ],
@@ -940,12 +854,12 @@ class TestPydanticModels:
         )
         
         assert response.run_id == "run-123"
-        assert response.status == RunStatus.COMPLETED
+        assert response.status == acp.RunStatus.COMPLETED
         assert response.execution_time_ms == 123.45
     
-    def test_agent_info_model(self):
+    def test_agent_info_model(self, acp):
         """Test AgentInfo model."""
-        agent = AgentInfo(
+        agent = acp.AgentInfo(
             name="test-agent",
             description="Test agent",
             capabilities=["test_cap"],
@@ -955,11 +869,11 @@ class TestPydanticModels:
         assert agent.name == "test-agent"
         assert len(agent.capabilities) == 1
     
-    def test_agents_response_model(self):
+    def test_agents_response_model(self, acp):
         """Test AgentsResponse model."""
-        response = AgentsResponse(
+        response = acp.AgentsResponse(
             agents=[
-                AgentInfo(
+                acp.AgentInfo(
                     name="agent1",
                     description="Agent 1",
                     capabilities=["cap1"],
@@ -972,13 +886,13 @@ class TestPydanticModels:
         assert response.count == 1
         assert len(response.agents) == 1
     
-    def test_health_response_model(self):
+    def test_health_response_model(self, acp):
         """Test HealthResponse model."""
-        response = HealthResponse(
+        response = acp.HealthResponse(
             status="healthy",
             service="test-service",
             version="1.0.0",
-            timestamp=datetime.now(UTC).isoformat()
+            timestamp=_FROZEN_TS
         )
         
         assert response.status == "healthy"
@@ -988,19 +902,19 @@ class TestPydanticModels:
 class TestErrorHandling:
     """Tests for error handling."""
     
-    def test_invalid_json_body(self, client):
+    async def test_invalid_json_body(self, aclient):
         """Test that invalid JSON returns proper error."""
-        response = client.post(
+        response = await aclient.post(
             "/run",
-            data="invalid json",
+            content="invalid json",
             headers={"Content-Type": "application/json"}
         )
         
         assert response.status_code == 422
     
-    def test_missing_required_fields(self, client):
+    async def test_missing_required_fields(self, aclient):
         """Test that missing required fields returns validation error."""
-        response = client.post(
+        response = await aclient.post(
             "/run",
             json={}
         )
@@ -1011,10 +925,10 @@ class TestErrorHandling:
 class TestCORSHeaders:
     """Tests for CORS headers."""
     
-    def test_cors_headers_present(self, client):
+    async def test_cors_headers_present(self, aclient):
         """Test that CORS headers are present."""
         # Test CORS headers on a GET request
-        response = client.get("/agents")
+        response = await aclient.get("/agents")
         
         # CORS headers should be present in response
         assert response.status_code == 200
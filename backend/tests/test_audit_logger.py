@@ -2,23 +2,34 @@
 Unit tests for AuditLogger
 """
 
-from datetime import UTC, datetime
-from unittest.mock import AsyncMock, Mock
+import asyncio
+import json
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 import httpx
 import pytest
 
 from src.core.audit_logger import (
+    MAX_CONCURRENT_RETRIES,
     AuditLogger,
     EventOutcome,
     Protocol,
     create_audit_logger_from_env,
 )
 
+# Tests only check that a timestamp is carried through, never its value
+_FROZEN_TS = "2024-01-01T00:00:00+00:00"
 
-@pytest.fixture
+# Events API responses are only read for status_code and text
+OK_RESPONSE = SimpleNamespace(status_code=200, text="")
+BAD_RESPONSE = SimpleNamespace(status_code=400, text="Bad Request")
+
+
+@pytest.fixture(scope="module")
 def audit_logger():
-    """Create AuditLogger instance for testing."""
+    """Create AuditLogger instance shared by the module's tests."""
     return AuditLogger(
         events_api_url="https://events.test.com/api/v1",
         events_api_token="test-token",
@@ -27,7 +38,7 @@ def audit_logger():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def audit_logger_no_api():
     """Create AuditLogger without Events API configured."""
     return AuditLogger(
@@ -35,6 +46,71 @@ def audit_logger_no_api():
     )
 
 
+@pytest.fixture(autouse=True)
+def _reset_audit_logger(audit_logger):
+    """Restore the shared logger's attributes and retry queue after each test."""
+    attributes = dict(vars(audit_logger))
+    queued = list(audit_logger.failed_events_queue)
+    yield
+    audit_logger._close_log_fd()
+    vars(audit_logger).clear()
+    vars(audit_logger).update(attributes)
+    audit_logger.failed_events_queue.clear()
+    audit_logger.failed_events_queue.extend(queued)
+
+
+@pytest.fixture(autouse=True)
+def _quiet_logs():
+    """Drop audit logger records by default so no handlers run for them."""
+    audit_log = logging.getLogger("src.core.audit_logger")
+    disabled = audit_log.disabled
+    audit_log.disabled = True
+    yield
+    audit_log.disabled = disabled
+
+
+@pytest.fixture
+def _loud_logs(_quiet_logs):
+    """Re-enable audit logger records for tests that assert on caplog."""
+    logging.getLogger("src.core.audit_logger").disabled = False
+
+
+@pytest.fixture(scope="module")
+def mock_http():
+    """Shared async HTTP client mock for the module's API tests."""
+    client = AsyncMock()
+    client.post.return_value = OK_RESPONSE
+    return client
+
+
+@pytest.fixture(autouse=True)
+def _wire_http(mock_http, audit_logger):
+    """Reset the shared HTTP mock and install it on the shared logger."""
+    mock_http.reset_mock()
+    mock_http.post.side_effect = None
+    mock_http.post.return_value = OK_RESPONSE
+    audit_logger.http_client = mock_http
+    yield
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """Skip real backoff delays in retry tests."""
+
+    async def _sleep(_delay):
+        return None
+
+    monkeypatch.setattr("src.core.audit_logger.asyncio.sleep", _sleep)
+
+
+@pytest.fixture
+def captured_logs(monkeypatch, audit_logger):
+    """Capture locally logged events in memory instead of writing a file."""
+    events: list[dict] = []
+    monkeypatch.setattr(audit_logger, "_log_event_locally", events.append)
+    return events
+
+
 class TestEnums:
     """Tests for enum definitions."""
 
@@ -84,6 +160,7 @@ class TestAuditLoggerInit:
         assert logger.events_api_token == "env-token"
         assert logger.events_api_enabled is True
 
+    @pytest.mark.usefixtures("_loud_logs")
     def test_init_without_api_config(self, caplog):
         """Test initialization without Events API configuration."""
         logger = AuditLogger(events_api_url=None, events_api_token=None)
@@ -148,7 +225,7 @@ class TestLocalLogging:
         audit_logger.local_log_file = str(log_file)
         audit_logger.enable_local_fallback = True
 
-        event = {"event_type": "test_event", "timestamp": datetime.now(UTC).isoformat()}
+        event = {"event_type": "test_event", "timestamp": _FROZEN_TS}
 
         audit_logger._log_event_locally(event)
 
@@ -156,6 +233,39 @@ class TestLocalLogging:
         content = log_file.read_text()
         assert "test_event" in content
 
+    async def test_log_event_locally_reuses_descriptor(self, tmp_path):
+        """Test consecutive events share one open file descriptor."""
+        log_file = tmp_path / "audit.log"
+        logger = AuditLogger(local_log_file=str(log_file))
+
+        logger._log_event_locally({"event_type": "first"})
+        fd = logger._log_fd
+        logger._log_event_locally({"event_type": "second"})
+
+        assert logger._log_fd == fd
+        assert len(log_file.read_text().splitlines()) == 2
+
+        await logger.close()
+
+        assert logger._log_fd is None
+
+    @pytest.mark.parametrize("rotate", ["rename", "unlink"])
+    async def test_log_event_locally_reopens_after_rotation(self, tmp_path, rotate):
+        """Test events after a log rotation go to the new file at the path."""
+        log_file = tmp_path / "audit.log"
+        logger = AuditLogger(local_log_file=str(log_file))
+
+        logger._log_event_locally({"event_type": "before"})
+        if rotate == "rename":
+            log_file.rename(tmp_path / "audit.log.1")
+        else:
+            log_file.unlink()
+        logger._log_event_locally({"event_type": "after"})
+
+        assert [json.loads(line)["event_type"] for line in log_file.read_text().splitlines()] == ["after"]
+
+        await logger.close()
+
     def test_log_event_locally_disabled(self, audit_logger):
         """Test local logging is skipped when disabled."""
         audit_logger.enable_local_fallback = False
@@ -165,6 +275,7 @@ class TestLocalLogging:
         # Should not raise error even if file doesn't exist
         audit_logger._log_event_locally(event)
 
+    @pytest.mark.usefixtures("_loud_logs")
     def test_log_event_locally_handles_errors(self, audit_logger, caplog):
         """Test local logging handles write errors gracefully."""
         audit_logger.local_log_file = "/invalid/path/audit.log"
@@ -180,30 +291,19 @@ class TestLocalLogging:
 class TestEventsAPIPosting:
     """Tests for Events API event posting."""
 
-    @pytest.mark.asyncio
-    async def test_post_event_success(self, audit_logger):
+    async def test_post_event_success(self, audit_logger, mock_http):
         """Test successful event posting to API."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-
-        mock_client = AsyncMock()
-        mock_client.post.return_value = mock_response
-
-        audit_logger.http_client = mock_client
+        mock_http.post.return_value = OK_RESPONSE
 
         event = {"event_type": "test_event"}
         result = await audit_logger._post_event_to_api(event)
 
         assert result is True
-        mock_client.post.assert_called_once()
+        mock_http.post.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_post_event_api_error(self, audit_logger):
+    async def test_post_event_api_error(self, audit_logger, mock_http):
         """Test event posting handles API errors."""
-        mock_client = AsyncMock()
-        mock_client.post.side_effect = Exception("Connection error")
-
-        audit_logger.http_client = mock_client
+        mock_http.post.side_effect = httpx.ConnectError("Connection error")
         audit_logger.max_retries = 0  # Disable retries for this test
 
         event = {"event_type": "test_event"}
@@ -211,24 +311,54 @@ class TestEventsAPIPosting:
 
         assert result is False
 
-    @pytest.mark.asyncio
-    async def test_post_event_retry_logic(self, audit_logger):
+    async def test_post_event_retry_logic(self, audit_logger, mock_http, no_sleep):
         """Test event posting retry with exponential backoff."""
-        mock_client = AsyncMock()
         # Fail first attempt, succeed on second
-        mock_client.post.side_effect = [Exception("Timeout"), Mock(status_code=200)]
-
-        audit_logger.http_client = mock_client
+        mock_http.post.side_effect = [
+            httpx.ReadTimeout("Timeout"),
+            OK_RESPONSE,
+        ]
         audit_logger.max_retries = 2
-        audit_logger.retry_delay = 0.01  # Fast retry for testing
 
         event = {"event_type": "test_event"}
         result = await audit_logger._post_event_to_api(event)
 
         assert result is True
-        assert mock_client.post.call_count == 2
+        assert mock_http.post.call_count == 2
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            httpx.ConnectTimeout("Timeout"),
+            httpx.ConnectError("Connection refused"),
+            httpx.RemoteProtocolError("Server disconnected without sending a response"),
+        ],
+        ids=["timeout", "network", "protocol"],
+    )
+    async def test_post_event_retries_transport_errors(
+        self, audit_logger, mock_http, no_sleep, error
+    ):
+        """Test transport errors are retried up to max_retries."""
+        mock_http.post.side_effect = error
+        audit_logger.max_retries = 2
+
+        result = await audit_logger._post_event_to_api({"event_type": "test_event"})
+
+        assert result is False
+        assert mock_http.post.call_count == 3
+
+    async def test_post_event_unexpected_error_not_retried(
+        self, audit_logger, mock_http, no_sleep
+    ):
+        """Test non-transport errors fail without retrying."""
+        mock_http.post.side_effect = ValueError("Unserializable event")
+        audit_logger.max_retries = 2
+
+        result = await audit_logger._post_event_to_api({"event_type": "test_event"})
+
+        assert result is False
+        assert mock_http.post.call_count == 1
 
-    @pytest.mark.asyncio
     async def test_post_event_no_api_configured(self, audit_logger_no_api):
         """Test event posting returns False when API not configured."""
         event = {"event_type": "test_event"}
@@ -236,17 +366,9 @@ class TestEventsAPIPosting:
 
         assert result is False
 
-    @pytest.mark.asyncio
-    async def test_post_event_bad_status_code(self, audit_logger):
+    async def test_post_event_bad_status_code(self, audit_logger, mock_http):
         """Test event posting handles non-success status codes."""
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.text = "Bad Request"
-
-        mock_client = AsyncMock()
-        mock_client.post.return_value = mock_response
-
-        audit_logger.http_client = mock_client
+        mock_http.post.return_value = BAD_RESPONSE
         audit_logger.max_retries = 0
 
         event = {"event_type": "test_event"}
@@ -255,64 +377,83 @@ class TestEventsAPIPosting:
         assert result is False
 
 
-class TestCredentialAccessLogging:
-    """Tests for log_credential_access method."""
-
-    @pytest.mark.asyncio
-    async def test_log_credential_access_success(self, audit_logger, tmp_path):
-        """Test logging credential access event."""
-        log_file = tmp_path / "audit.log"
-        audit_logger.local_log_file = str(log_file)
-
-        mock_client = AsyncMock()
-        mock_client.post.return_value = Mock(status_code=200)
-        audit_logger.http_client = mock_client
-
-        await audit_logger.log_credential_access(
-            protocol="mcp",
-            agent_id="test-agent",
-            resource="database/prod-db",
-            outcome="success",
-        )
-
-        # Check local log
-        assert log_file.exists()
-        content = log_file.read_text()
-        assert "credential_access" in content
-        assert "test-agent" in content
-
-        # Check API call
-        mock_client.post.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_log_credential_access_with_metadata(self, audit_logger, tmp_path):
-        """Test logging credential access with metadata."""
-        log_file = tmp_path / "audit.log"
-        audit_logger.local_log_file = str(log_file)
-
-        mock_client = AsyncMock()
-        mock_client.post.return_value = Mock(status_code=200)
-        audit_logger.http_client = mock_client
-
-        metadata = {"error": "Permission denied"}
-
-        await audit_logger.log_credential_access(
-            protocol="a2a",
-            agent_id="test-agent",
-            resource="api/secret-key",
-            outcome="denied",
-            metadata=metadata,
-        )
-
-        content = log_file.read_text()
-        assert "Permission denied" in content
-
-    @pytest.mark.asyncio
-    async def test_log_credential_access_api_failure_queues_event(self, audit_logger):
+class TestEventLogging:
+    """Tests for the log_credential_access and log_token_* methods."""
+
+    @pytest.mark.parametrize(
+        "method,kwargs,expects",
+        [
+            (
+                "log_credential_access",
+                {
+                    "protocol": "mcp",
+                    "agent_id": "test-agent",
+                    "resource": "database/prod-db",
+                    "outcome": "success",
+                },
+                {"event_type": "credential_access", "agent_id": "test-agent"},
+            ),
+            (
+                "log_credential_access",
+                {
+                    "protocol": "a2a",
+                    "agent_id": "test-agent",
+                    "resource": "api/secret-key",
+                    "outcome": "denied",
+                    "metadata": {"error": "Permission denied"},
+                },
+                {"outcome": "denied", "metadata": {"error": "Permission denied"}},
+            ),
+            (
+                "log_token_generation",
+                {
+                    "protocol": "a2a",
+                    "agent_id": "test-agent",
+                    "resource": "ssh/prod-server",
+                    "ttl_minutes": 10,
+                },
+                {"event_type": "token_generation", "metadata": {"ttl_minutes": 10}},
+            ),
+            (
+                "log_token_validation",
+                {"protocol": "acp", "agent_id": "test-agent", "success": True},
+                {"event_type": "token_validation", "outcome": "success"},
+            ),
+            (
+                "log_token_validation",
+                {
+                    "protocol": "mcp",
+                    "agent_id": "test-agent",
+                    "success": False,
+                    "metadata": {"error": "Token expired"},
+                },
+                {"outcome": "failure", "metadata": {"error": "Token expired"}},
+            ),
+        ],
+        ids=[
+            "credential_access",
+            "credential_access_metadata",
+            "token_generation",
+            "token_validation_success",
+            "token_validation_failure",
+        ],
+    )
+    async def test_log_event(
+        self, audit_logger, mock_http, captured_logs, method, kwargs, expects
+    ):
+        """Test each log method writes locally and posts to the API."""
+        await getattr(audit_logger, method)(**kwargs)
+
+        event = captured_logs[-1]
+        for field, expected in expects.items():
+            assert event[field] == expected
+        mock_http.post.assert_called_once()
+
+    async def test_log_credential_access_api_failure_queues_event(
+        self, audit_logger, mock_http
+    ):
         """Test failed API post queues event for retry."""
-        mock_client = AsyncMock()
-        mock_client.post.side_effect = Exception("API Error")
-        audit_logger.http_client = mock_client
+        mock_http.post.side_effect = httpx.ConnectError("API Error")
         audit_logger.max_retries = 0
 
         await audit_logger.log_credential_access(
@@ -325,97 +466,30 @@ class TestCredentialAccessLogging:
         assert audit_logger.get_queue_size() == 1
 
 
-class TestTokenLogging:
-    """Tests for token generation and validation logging."""
-
-    @pytest.mark.asyncio
-    async def test_log_token_generation(self, audit_logger, tmp_path):
-        """Test logging token generation event."""
-        log_file = tmp_path / "audit.log"
-        audit_logger.local_log_file = str(log_file)
-
-        mock_client = AsyncMock()
-        mock_client.post.return_value = Mock(status_code=200)
-        audit_logger.http_client = mock_client
-
-        await audit_logger.log_token_generation(
-            protocol="a2a",
-            agent_id="test-agent",
-            resource="ssh/prod-server",
-            ttl_minutes=10,
-        )
-
-        content = log_file.read_text()
-        assert "token_generation" in content
-        assert "10" in content  # TTL
-
-    @pytest.mark.asyncio
-    async def test_log_token_validation_success(self, audit_logger, tmp_path):
-        """Test logging successful token validation."""
-        log_file = tmp_path / "audit.log"
-        audit_logger.local_log_file = str(log_file)
-
-        mock_client = AsyncMock()
-        mock_client.post.return_value = Mock(status_code=200)
-        audit_logger.http_client = mock_client
-
-        await audit_logger.log_token_validation(
-            protocol="acp", agent_id="test-agent", success=True
-        )
-
-        content = log_file.read_text()
-        assert "token_validation" in content
-        assert "success" in content
-
-    @pytest.mark.asyncio
-    async def test_log_token_validation_failure(self, audit_logger, tmp_path):
-        """Test logging failed token validation."""
-        log_file = tmp_path / "audit.log"
-        audit_logger.local_log_file = str(log_file)
-
-        mock_client = AsyncMock()
-        mock_client.post.return_value = Mock(status_code=200)
-        audit_logger.http_client = mock_client
-
-        metadata = {"error": "Token expired"}
-
-        await audit_logger.log_token_validation(
-            protocol="mcp", agent_id="test-agent", success=False, metadata=metadata
-        )
-
-        content = log_file.read_text()
-        assert "failure" in content
-
-
 class TestRetryMechanism:
     """Tests for failed event retry mechanism."""
 
-    @pytest.mark.asyncio
     async def test_retry_failed_events_success(self, audit_logger):
         """Test retrying failed events successfully."""
         # Add events to queue with proper structure
         audit_logger.failed_events_queue.append({"event_type": "test_event_1"})
         audit_logger.failed_events_queue.append({"event_type": "test_event_2"})
 
-        mock_client = AsyncMock()
-        mock_client.post.return_value = Mock(status_code=200)
-        audit_logger.http_client = mock_client
-
         successful = await audit_logger.retry_failed_events()
 
         assert successful == 2
         assert audit_logger.get_queue_size() == 0
 
-    @pytest.mark.asyncio
-    async def test_retry_failed_events_partial_success(self, audit_logger):
+    async def test_retry_failed_events_partial_success(self, audit_logger, mock_http):
         """Test retrying failed events with partial success."""
         audit_logger.failed_events_queue.append({"event_type": "test_event_1"})
         audit_logger.failed_events_queue.append({"event_type": "test_event_2"})
 
-        mock_client = AsyncMock()
         # First succeeds, second fails
-        mock_client.post.side_effect = [Mock(status_code=200), Exception("API Error")]
-        audit_logger.http_client = mock_client
+        mock_http.post.side_effect = [
+            OK_RESPONSE,
+            httpx.ConnectError("API Error"),
+        ]
         audit_logger.max_retries = 0
 
         successful = await audit_logger.retry_failed_events()
@@ -423,7 +497,48 @@ class TestRetryMechanism:
         assert successful == 1
         assert audit_logger.get_queue_size() == 1
 
-    @pytest.mark.asyncio
+    async def test_retry_failed_events_batched(self, audit_logger, mock_http):
+        """Test queued events are retried concurrently, not one at a time."""
+        calls = []
+
+        async def slow_post(url, json):
+            calls.append(("start", json["event_type"]))
+            await asyncio.sleep(0)
+            calls.append(("end", json["event_type"]))
+            return OK_RESPONSE
+
+        mock_http.post.side_effect = slow_post
+        for i in range(3):
+            audit_logger.failed_events_queue.append({"event_type": f"event_{i}"})
+
+        successful = await audit_logger.retry_failed_events()
+
+        assert successful == 3
+        assert audit_logger.get_queue_size() == 0
+        # Every post starts before the first one finishes
+        assert [kind for kind, _ in calls[:3]] == ["start"] * 3
+
+    async def test_retry_failed_events_bounds_concurrency(self, audit_logger, mock_http):
+        """Test no more than MAX_CONCURRENT_RETRIES posts are in flight at once."""
+        in_flight = peak = 0
+
+        async def slow_post(url, json):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return OK_RESPONSE
+
+        mock_http.post.side_effect = slow_post
+        for i in range(MAX_CONCURRENT_RETRIES * 3):
+            audit_logger.failed_events_queue.append({"event_type": f"event_{i}"})
+
+        successful = await audit_logger.retry_failed_events()
+
+        assert successful == MAX_CONCURRENT_RETRIES * 3
+        assert peak == MAX_CONCURRENT_RETRIES
+
     async def test_retry_failed_events_empty_queue(self, audit_logger):
         """Test retrying with empty queue."""
         successful = await audit_logger.retry_failed_events()
@@ -434,32 +549,38 @@ class TestRetryMechanism:
 class TestHTTPClientManagement:
     """Tests for HTTP client management."""
 
-    @pytest.mark.asyncio
-    async def test_get_http_client_creates_client(self, audit_logger):
-        """Test HTTP client is created on first access."""
-        assert audit_logger.http_client is None
+    @pytest.fixture
+    def fast_httpx(self, monkeypatch, audit_logger):
+        """Swap httpx.AsyncClient for a stub class and clear the wired client."""
+        client_cls = MagicMock(return_value=MagicMock(spec=httpx.AsyncClient))
+        monkeypatch.setattr("src.core.audit_logger.httpx.AsyncClient", client_cls)
+        audit_logger.http_client = None
+        return client_cls
 
+    async def test_get_http_client_creates_client(self, audit_logger, fast_httpx):
+        """Test HTTP client is created on first access."""
         client = await audit_logger._get_http_client()
 
-        assert client is not None
-        assert isinstance(client, httpx.AsyncClient)
+        assert client is fast_httpx.return_value
+        headers = fast_httpx.call_args.kwargs["headers"]
+        assert headers["Authorization"] == "Bearer test-token"
 
-    @pytest.mark.asyncio
-    async def test_get_http_client_reuses_client(self, audit_logger):
+    async def test_get_http_client_reuses_client(self, audit_logger, fast_httpx):
         """Test HTTP client is reused on subsequent calls."""
         client1 = await audit_logger._get_http_client()
         client2 = await audit_logger._get_http_client()
 
         assert client1 is client2
+        assert fast_httpx.call_count == 1
 
-    @pytest.mark.asyncio
-    async def test_close_client(self, audit_logger):
+    async def test_close_client(self, audit_logger, fast_httpx):
         """Test closing HTTP client."""
-        await audit_logger._get_http_client()
+        client = await audit_logger._get_http_client()
         assert audit_logger.http_client is not None
 
         await audit_logger.close()
 
+        client.aclose.assert_awaited_once()
         assert audit_logger.http_client is None
 
 
@@ -504,16 +625,43 @@ class TestConvenienceFunctions:
 class TestQueueLimits:
     """Tests for queue size limits."""
 
-    @pytest.mark.asyncio
-    async def test_queue_max_size(self, audit_logger):
+    async def test_queue_max_size(self, audit_logger, mock_http):
         """Test queue respects maximum size."""
-        mock_client = AsyncMock()
-        mock_client.post.side_effect = Exception("API Error")
-        audit_logger.http_client = mock_client
+        mock_http.post.side_effect = httpx.ConnectError("API Error")
+        audit_logger.max_retries = 0
+        audit_logger.enable_local_fallback = False
+
+        event = audit_logger._create_event_payload(
+            event_type="credential_access",
+            protocol="mcp",
+            agent_id="test-agent",
+            resource="test",
+            outcome="success",
+        )
+
+        # Fill past the maximum queue size (1000) without going through the API
+        for _ in range(1100):
+            audit_logger.failed_events_queue.append(event)
+
+        # One more failed post exercises the truncation path
+        await audit_logger.log_credential_access(
+            protocol="mcp",
+            agent_id="agent-overflow",
+            resource="test",
+            outcome="success",
+        )
+
+        # Queue should be capped at 1000, newest event last
+        assert audit_logger.get_queue_size() == 1000
+        assert audit_logger.failed_events_queue[-1]["agent_id"] == "agent-overflow"
+
+    async def test_queue_collects_failed_events(self, audit_logger, mock_http):
+        """Test each failed post through log_credential_access is queued."""
+        mock_http.post.side_effect = httpx.ConnectError("API Error")
         audit_logger.max_retries = 0
+        audit_logger.enable_local_fallback = False
 
-        # Add more events than max queue size (1000)
-        for i in range(1100):
+        for i in range(3):
             await audit_logger.log_credential_access(
                 protocol="mcp",
                 agent_id=f"agent-{i}",
@@ -521,5 +669,9 @@ class TestQueueLimits:
                 outcome="success",
             )
 
-        # Queue should be capped at 1000
-        assert audit_logger.get_queue_size() == 1000
+        assert audit_logger.get_queue_size() == 3
+        assert [e["agent_id"] for e in audit_logger.failed_events_queue] == [
+            "agent-0",
+            "agent-1",
+            "agent-2",
+        ]
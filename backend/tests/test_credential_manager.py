@@ -3,51 +3,120 @@ Unit tests for CredentialManager
 """
 
 from datetime import UTC, datetime, timedelta
-from unittest.mock import Mock, patch
+from types import MappingProxyType
+from unittest.mock import Mock, call
 
-import jwt
 import pytest
+from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 
 from src.core.credential_manager import (
     CredentialManager,
     ResourceType,
     create_credential_manager_from_env,
 )
+from src.core.onepassword_client import OnePasswordClient
+
+# Resource types as plain strings, the way callers pass them to CredentialManager
+_RESOURCE_TYPES = ("database", "api", "ssh", "generic")
+
+# Read-only so one copy can be shared by every test
+_SAMPLE_CREDS = MappingProxyType(
+    {
+        "username": "dbuser",
+        "password": "dbpass123",
+        "host": "localhost",
+        "port": "5432",
+        "_item_id": "item-123",
+        "_item_title": "Production Database",
+        "_vault_id": "vault-123",
+    }
+)
+
+# Opaque 1Password item; the mocked extract_credential_fields never inspects it
+_ITEM = object()
+
+# 1Password health payloads; CredentialManager.health_check never mutates them
+_HEALTHY = {"status": "healthy", "connected": True, "vault_accessible": True}
+_UNHEALTHY = {"status": "unhealthy", "connected": False, "vault_accessible": False}
+
+# Token timestamps only need to be plausible, so read the clock once at import
+_NOW = datetime.now(UTC).timestamp()
+
+
+def _verify_payload(sub="test-agent", ttl=5):
+    """Build the verify_jwt payload for a token issued at _NOW."""
+    return {"sub": sub, "ttl_minutes": ttl, "iat": _NOW, "exp": _NOW + ttl * 60}
+
+
+# Token payloads that validate_token and get_credentials_from_token only read
+_VALIDATE_OK = {
+    "sub": "test-agent",
+    "resource_type": "database",
+    "resource_name": "prod-db",
+    "iat": _NOW,
+    "exp": _NOW + 300,
+}
+_DECRYPT_OK = {
+    "agent_id": "test-agent",
+    "credentials": _SAMPLE_CREDS,
+    "resource_type": "database",
+    "resource_name": "prod-db",
+    "issued_at": _NOW,
+    "expires_at": _NOW + 300,
+    "ttl_minutes": 5,
+}
+
+
+def _run_fetch(
+    manager, op_client, name, credentials, resource_type="database", vault_id=None
+):
+    """Fetch credentials for an item that exists; return the result and lookup call."""
+    op_client.get_item_by_title.return_value = _ITEM
+    op_client.extract_credential_fields.return_value = credentials
+
+    result = manager.fetch_credentials(
+        resource_type=resource_type, resource_name=name, vault_id=vault_id
+    )
+
+    return result, op_client.get_item_by_title.call_args
+
+
+@pytest.fixture(scope="session")
+def op_client_prototype():
+    """OnePasswordClient mock built once and recycled by mock_op_client."""
+    return Mock(spec_set=OnePasswordClient)
+
+
+@pytest.fixture(scope="session")
+def token_manager_prototype():
+    """TokenManager mock built once and recycled by mock_token_manager."""
+    return Mock()
 
 
 @pytest.fixture
-def mock_op_client():
+def mock_op_client(op_client_prototype):
     """Mock OnePasswordClient."""
-    client = Mock()
-    client.health_check.return_value = {
-        "status": "healthy",
-        "connected": True,
-        "vault_accessible": True,
-    }
+    # copy.copy of a Mock shares its child mocks, so reset the prototype instead
+    client = op_client_prototype
+    client.reset_mock(return_value=True, side_effect=True)
+    client.health_check.return_value = _HEALTHY
     return client
 
 
 @pytest.fixture
-def mock_token_manager():
+def mock_token_manager(token_manager_prototype):
     """Mock TokenManager."""
-    manager = Mock()
+    manager = token_manager_prototype
+    manager.reset_mock(return_value=True, side_effect=True)
     manager.jwt_algorithm = "HS256"
     manager.default_ttl_minutes = 5
     return manager
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_credentials():
     """Sample credential data."""
-    return {
-        "username": "dbuser",
-        "password": "dbpass123",
-        "host": "localhost",
-        "port": "5432",
-        "_item_id": "item-123",
-        "_item_title": "Production Database",
-        "_vault_id": "vault-123",
-    }
+    return _SAMPLE_CREDS
 
 
 @pytest.fixture
@@ -70,10 +139,15 @@ class TestCredentialManagerInit:
         assert manager.op_client == mock_op_client
         assert manager.token_mgr == mock_token_manager
 
-    @patch("src.core.credential_manager.OnePasswordClient")
-    @patch("src.core.credential_manager.TokenManager")
-    def test_init_creates_defaults(self, mock_token_cls, mock_op_cls):
+    def test_init_creates_defaults(self, monkeypatch):
         """Test initialization creates default clients if not provided."""
+        mock_op_cls = Mock()
+        mock_token_cls = Mock()
+        monkeypatch.setattr(
+            "src.core.credential_manager.OnePasswordClient", mock_op_cls
+        )
+        monkeypatch.setattr("src.core.credential_manager.TokenManager", mock_token_cls)
+
         CredentialManager()
 
         mock_op_cls.assert_called_once()
@@ -106,35 +180,34 @@ class TestFetchCredentials:
         self, credential_manager, mock_op_client, sample_credentials
     ):
         """Test successful credential fetching."""
-        mock_op_client.get_item_by_title.return_value = Mock()
-        mock_op_client.extract_credential_fields.return_value = sample_credentials
-
-        result = credential_manager.fetch_credentials(
-            resource_type="database", resource_name="Production Database"
+        result, lookup = _run_fetch(
+            credential_manager,
+            mock_op_client,
+            "Production Database",
+            sample_credentials,
         )
 
         assert result == sample_credentials
-        mock_op_client.get_item_by_title.assert_called_once_with(
-            "Production Database", None
-        )
-        mock_op_client.extract_credential_fields.assert_called_once()
+        assert mock_op_client.get_item_by_title.call_count == 1
+        assert lookup == call("Production Database", None)
+        extract = mock_op_client.extract_credential_fields
+        assert extract.call_count == 1
+        assert extract.call_args == call(_ITEM)
 
     def test_fetch_credentials_with_vault_id(
         self, credential_manager, mock_op_client, sample_credentials
     ):
         """Test credential fetching with specific vault ID."""
-        mock_op_client.get_item_by_title.return_value = Mock()
-        mock_op_client.extract_credential_fields.return_value = sample_credentials
-
-        credential_manager.fetch_credentials(
-            resource_type="database",
-            resource_name="Test DB",
+        _, lookup = _run_fetch(
+            credential_manager,
+            mock_op_client,
+            "Test DB",
+            sample_credentials,
             vault_id="custom-vault-123",
         )
 
-        mock_op_client.get_item_by_title.assert_called_once_with(
-            "Test DB", "custom-vault-123"
-        )
+        assert mock_op_client.get_item_by_title.call_count == 1
+        assert lookup == call("Test DB", "custom-vault-123")
 
     def test_fetch_credentials_invalid_resource_type(self, credential_manager):
         """Test credential fetching fails with invalid resource type."""
@@ -165,83 +238,49 @@ class TestFetchCredentials:
 class TestIssueEphemeralToken:
     """Tests for issue_ephemeral_token method."""
 
-    def test_issue_token_success(
-        self, credential_manager, mock_token_manager, sample_credentials
+    @pytest.mark.parametrize(
+        "rtype,rname,ttl,exp_seconds",
+        [
+            ("database", "prod-db", 5, 300),
+            ("api", "api-key", None, 300),
+            ("ssh", "prod-server", 15, 900),
+        ],
+        ids=["database_ttl_5", "api_default_ttl", "ssh_ttl_15"],
+    )
+    def test_issue_token(
+        self,
+        credential_manager,
+        mock_token_manager,
+        sample_credentials,
+        rtype,
+        rname,
+        ttl,
+        exp_seconds,
     ):
-        """Test successful token issuance."""
+        """Test token issuance across resource types and TTLs."""
         mock_token = "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9..."
         mock_token_manager.generate_jwt.return_value = mock_token
-        mock_token_manager.verify_jwt.return_value = {
-            "sub": "test-agent",
-            "ttl_minutes": 5,
-            "iat": datetime.now(UTC).timestamp(),
-            "exp": (datetime.now(UTC) + timedelta(minutes=5)).timestamp(),
-        }
+        mock_token_manager.verify_jwt.return_value = _verify_payload(ttl=ttl or 5)
 
         result = credential_manager.issue_ephemeral_token(
             credentials=sample_credentials,
             agent_id="test-agent",
-            resource_type="database",
-            resource_name="prod-db",
-            ttl_minutes=5,
+            resource_type=rtype,
+            resource_name=rname,
+            ttl_minutes=ttl,
         )
 
         assert result["token"] == mock_token
-        assert result["expires_in"] == 300  # 5 minutes in seconds
-        assert result["resource"] == "database/prod-db"
-        assert result["ttl_minutes"] == 5
+        assert result["expires_in"] == exp_seconds
+        assert result["resource"] == f"{rtype}/{rname}"
+        assert result["ttl_minutes"] == (ttl or 5)
         assert "issued_at" in result
         assert "expires_at" in result
 
+        # Omitted TTL is passed through so the token manager applies its default
         mock_token_manager.generate_jwt.assert_called_once()
-
-    def test_issue_token_default_ttl(
-        self, credential_manager, mock_token_manager, sample_credentials
-    ):
-        """Test token issuance with default TTL."""
-        mock_token = "test.jwt.token"
-        mock_token_manager.generate_jwt.return_value = mock_token
-        mock_token_manager.verify_jwt.return_value = {
-            "sub": "test-agent",
-            "ttl_minutes": 5,
-            "iat": datetime.now(UTC).timestamp(),
-            "exp": (datetime.now(UTC) + timedelta(minutes=5)).timestamp(),
-        }
-
-        credential_manager.issue_ephemeral_token(
-            credentials=sample_credentials,
-            agent_id="test-agent",
-            resource_type="api",
-            resource_name="api-key",
-        )
-
-        # Should use default TTL from token manager
         call_args = mock_token_manager.generate_jwt.call_args
-        assert call_args.kwargs["ttl_minutes"] is None
-
-    def test_issue_token_custom_ttl(
-        self, credential_manager, mock_token_manager, sample_credentials
-    ):
-        """Test token issuance with custom TTL."""
-        mock_token = "test.jwt.token"
-        mock_token_manager.generate_jwt.return_value = mock_token
-        mock_token_manager.verify_jwt.return_value = {
-            "sub": "test-agent",
-            "ttl_minutes": 15,
-            "iat": datetime.now(UTC).timestamp(),
-            "exp": (datetime.now(UTC) + timedelta(minutes=15)).timestamp(),
-        }
-
-        result = credential_manager.issue_ephemeral_token(
-            credentials=sample_credentials,
-            agent_id="test-agent",
-            resource_type="ssh",
-            resource_name="prod-server",
-            ttl_minutes=15,
-        )
-
-        assert result["ttl_minutes"] == 15
-        assert result["expires_in"] == 900  # 15 minutes
+        assert call_args.kwargs["ttl_minutes"] == ttl
 
 
 class TestFetchAndIssueToken:
@@ -252,15 +291,10 @@ class TestFetchAndIssueToken:
     ):
         """Test successful fetch and issue workflow."""
         # Setup mocks
-        mock_op_client.get_item_by_title.return_value = Mock()
+        mock_op_client.get_item_by_title.return_value = _ITEM
         mock_op_client.extract_credential_fields.return_value = sample_credentials
         mock_token_manager.generate_jwt.return_value = "test.jwt.token"
-        mock_token_manager.verify_jwt.return_value = {
-            "sub": "test-agent",
-            "ttl_minutes": 10,
-            "iat": datetime.now(UTC).timestamp(),
-            "exp": (datetime.now(UTC) + timedelta(minutes=10)).timestamp(),
-        }
+        mock_token_manager.verify_jwt.return_value = _verify_payload(ttl=10)
 
         result = credential_manager.fetch_and_issue_token(
             resource_type="database",
@@ -281,15 +315,10 @@ class TestFetchAndIssueToken:
         self, credential_manager, mock_op_client, mock_token_manager, sample_credentials
     ):
         """Test fetch and issue with custom vault ID."""
-        mock_op_client.get_item_by_title.return_value = Mock()
+        mock_op_client.get_item_by_title.return_value = _ITEM
         mock_op_client.extract_credential_fields.return_value = sample_credentials
         mock_token_manager.generate_jwt.return_value = "test.jwt.token"
-        mock_token_manager.verify_jwt.return_value = {
-            "sub": "test-agent",
-            "ttl_minutes": 5,
-            "iat": datetime.now(UTC).timestamp(),
-            "exp": (datetime.now(UTC) + timedelta(minutes=5)).timestamp(),
-        }
+        mock_token_manager.verify_jwt.return_value = _verify_payload()
 
         credential_manager.fetch_and_issue_token(
             resource_type="api",
@@ -298,9 +327,9 @@ class TestFetchAndIssueToken:
             vault_id="custom-vault",
         )
 
-        mock_op_client.get_item_by_title.assert_called_once_with(
-            "api-key", "custom-vault"
-        )
+        lookup = mock_op_client.get_item_by_title
+        assert lookup.call_count == 1
+        assert lookup.call_args == call("api-key", "custom-vault")
 
 
 class TestValidateToken:
@@ -308,13 +337,7 @@ class TestValidateToken:
 
     def test_validate_token_success(self, credential_manager, mock_token_manager):
         """Test successful token validation."""
-        mock_token_manager.verify_jwt.return_value = {
-            "sub": "test-agent",
-            "resource_type": "database",
-            "resource_name": "prod-db",
-            "iat": datetime.now(UTC).timestamp(),
-            "exp": (datetime.now(UTC) + timedelta(minutes=5)).timestamp(),
-        }
+        mock_token_manager.verify_jwt.return_value = _VALIDATE_OK
         mock_token_manager.get_time_until_expiry.return_value = timedelta(minutes=5)
 
         result = credential_manager.validate_token("test.jwt.token")
@@ -327,16 +350,16 @@ class TestValidateToken:
 
     def test_validate_token_expired(self, credential_manager, mock_token_manager):
         """Test validation of expired token."""
-        mock_token_manager.verify_jwt.side_effect = jwt.ExpiredSignatureError()
+        mock_token_manager.verify_jwt.side_effect = ExpiredSignatureError()
 
-        with pytest.raises(jwt.ExpiredSignatureError):
+        with pytest.raises(ExpiredSignatureError):
             credential_manager.validate_token("expired.jwt.token")
 
     def test_validate_token_invalid(self, credential_manager, mock_token_manager):
         """Test validation of invalid token."""
-        mock_token_manager.verify_jwt.side_effect = jwt.InvalidTokenError()
+        mock_token_manager.verify_jwt.side_effect = InvalidTokenError()
 
-        with pytest.raises(jwt.InvalidTokenError):
+        with pytest.raises(InvalidTokenError):
             credential_manager.validate_token("invalid.jwt.token")
 
 
@@ -347,15 +370,7 @@ class TestGetCredentialsFromToken:
         self, credential_manager, mock_token_manager, sample_credentials
     ):
         """Test successful credential extraction from token."""
-        mock_token_manager.verify_and_decrypt.return_value = {
-            "agent_id": "test-agent",
-            "credentials": sample_credentials,
-            "resource_type": "database",
-            "resource_name": "prod-db",
-            "issued_at": datetime.now(UTC).timestamp(),
-            "expires_at": (datetime.now(UTC) + timedelta(minutes=5)).timestamp(),
-            "ttl_minutes": 5,
-        }
+        mock_token_manager.verify_and_decrypt.return_value = _DECRYPT_OK
 
         result = credential_manager.get_credentials_from_token("test.jwt.token")
 
@@ -368,32 +383,26 @@ class TestGetCredentialsFromToken:
         self, credential_manager, mock_token_manager
     ):
         """Test credential extraction from expired token fails."""
-        mock_token_manager.verify_and_decrypt.side_effect = jwt.ExpiredSignatureError()
+        mock_token_manager.verify_and_decrypt.side_effect = ExpiredSignatureError()
 
-        with pytest.raises(jwt.ExpiredSignatureError):
+        with pytest.raises(ExpiredSignatureError):
             credential_manager.get_credentials_from_token("expired.jwt.token")
 
     def test_get_credentials_invalid_token(
         self, credential_manager, mock_token_manager
     ):
         """Test credential extraction from invalid token fails."""
-        mock_token_manager.verify_and_decrypt.side_effect = jwt.InvalidTokenError()
+        mock_token_manager.verify_and_decrypt.side_effect = InvalidTokenError()
 
-        with pytest.raises(jwt.InvalidTokenError):
+        with pytest.raises(InvalidTokenError):
             credential_manager.get_credentials_from_token("invalid.jwt.token")
 
 
 class TestHealthCheck:
     """Tests for health_check method."""
 
-    def test_health_check_all_healthy(self, credential_manager, mock_op_client):
+    def test_health_check_all_healthy(self, credential_manager):
         """Test health check when all components are healthy."""
-        mock_op_client.health_check.return_value = {
-            "status": "healthy",
-            "connected": True,
-            "vault_accessible": True,
-        }
-
         result = credential_manager.health_check()
 
         assert result["status"] == "healthy"
@@ -402,11 +411,7 @@ class TestHealthCheck:
 
     def test_health_check_op_unhealthy(self, credential_manager, mock_op_client):
         """Test health check when 1Password is unhealthy."""
-        mock_op_client.health_check.return_value = {
-            "status": "unhealthy",
-            "connected": False,
-            "vault_accessible": False,
-        }
+        mock_op_client.health_check.return_value = _UNHEALTHY
 
         result = credential_manager.health_check()
 
@@ -427,10 +432,15 @@ class TestHealthCheck:
 class TestConvenienceFunctions:
     """Tests for convenience functions."""
 
-    @patch("src.core.credential_manager.OnePasswordClient")
-    @patch("src.core.credential_manager.TokenManager")
-    def test_create_from_env(self, mock_token_cls, mock_op_cls):
+    def test_create_from_env(self, monkeypatch):
         """Test convenience function to create manager from environment."""
+        mock_op_cls = Mock()
+        mock_token_cls = Mock()
+        monkeypatch.setattr(
+            "src.core.credential_manager.OnePasswordClient", mock_op_cls
+        )
+        monkeypatch.setattr("src.core.credential_manager.TokenManager", mock_token_cls)
+
         manager = create_credential_manager_from_env()
 
         assert isinstance(manager, CredentialManager)
@@ -441,30 +451,27 @@ class TestConvenienceFunctions:
 class TestEdgeCases:
     """Tests for edge cases and error handling."""
 
+    @pytest.mark.parametrize("resource_type", _RESOURCE_TYPES)
     def test_fetch_credentials_all_resource_types(
-        self, credential_manager, mock_op_client, sample_credentials
+        self, credential_manager, mock_op_client, sample_credentials, resource_type
     ):
         """Test fetching credentials for all supported resource types."""
-        mock_op_client.get_item_by_title.return_value = Mock()
-        mock_op_client.extract_credential_fields.return_value = sample_credentials
+        result, _ = _run_fetch(
+            credential_manager,
+            mock_op_client,
+            "Test Resource",
+            sample_credentials,
+            resource_type=resource_type,
+        )
 
-        for resource_type in ["database", "api", "ssh", "generic"]:
-            result = credential_manager.fetch_credentials(
-                resource_type=resource_type, resource_name="Test Resource"
-            )
-            assert result == sample_credentials
+        assert result == sample_credentials
 
     def test_issue_token_empty_credentials(
         self, credential_manager, mock_token_manager
     ):
         """Test issuing token with empty credentials."""
         mock_token_manager.generate_jwt.return_value = "test.token"
-        mock_token_manager.verify_jwt.return_value = {
-            "sub": "test-agent",
-            "ttl_minutes": 5,
-            "iat": datetime.now(UTC).timestamp(),
-            "exp": (datetime.now(UTC) + timedelta(minutes=5)).timestamp(),
-        }
+        mock_token_manager.verify_jwt.return_value = _verify_payload()
 
         result = credential_manager.issue_ephemeral_token(
             credentials={},
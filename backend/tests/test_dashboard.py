@@ -0,0 +1,222 @@
+"""
+Unit tests for the Streamlit dashboard helpers
+"""
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+st = pytest.importorskip("streamlit")
+
+from src.ui import dashboard  # noqa: E402
+from src.ui.dashboard import (  # noqa: E402
+    build_audit_frame,
+    category_mask,
+    encode_csv,
+    filter_events,
+    get_times_remaining,
+    new_audit_columns,
+)
+
+
+@pytest.fixture
+def session_state():
+    """Fresh dashboard session state for each test (Streamlit bare mode)."""
+    st.session_state.clear()
+    dashboard.init_session_state()
+    yield st.session_state
+    st.session_state.clear()
+
+
+def _audit_log_event(i):
+    """Audit log record as written by AuditLogger, numbered by i."""
+    return {
+        "timestamp": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}Z",
+        "protocol": "mcp",
+        "agent_id": f"agent-{i}",
+        "resource": "database/prod",
+        "outcome": "success",
+    }
+
+
+class TestApplyAuditEvents:
+    """Tests for folding audit log events into the dashboard."""
+
+    def test_apply_audit_events_keeps_newest_events_first(self, session_state):
+        """Test only the newest MAX_AUDIT_EVENTS are kept, most recent first."""
+        max_events = dashboard.MAX_AUDIT_EVENTS
+        events = [_audit_log_event(i) for i in range(max_events + 50)]
+
+        dashboard._apply_audit_events(events[:-10])
+        dashboard._apply_audit_events(events[-10:])
+
+        agent_ids = list(session_state.audit_columns["agent_id"])
+        assert agent_ids == [f"agent-{i}" for i in reversed(range(50, max_events + 50))]
+        assert session_state.audit_columns["protocol"][0] == "MCP"
+        assert session_state.total_requests == max_events + 50
+        assert session_state.audit_version == 2
+
+
+def _events_frame():
+    """Audit event table with every protocol and outcome plus a missing protocol."""
+    return pd.DataFrame(
+        {
+            "protocol": pd.Categorical(
+                ["MCP", "A2A", None, "ACP", "MCP", "A2A"],
+                categories=dashboard.PROTOCOLS,
+            ),
+            "outcome": pd.Categorical(
+                ["success", "error", "success", "failure", "error", "success"],
+                categories=dashboard.OUTCOMES,
+            ),
+        }
+    )
+
+
+class TestCategoryMask:
+    """Tests for categorical row masks."""
+
+    @pytest.mark.parametrize(
+        "selected",
+        [["MCP"], ["A2A", "ACP"], [], ["MCP", "unknown"], list(dashboard.PROTOCOLS)],
+        ids=["one", "two", "none", "unknown", "all_with_missing"],
+    )
+    def test_category_mask_matches_isin(self, selected):
+        """Test the lookup-table mask selects the same rows as isin."""
+        column = _events_frame()["protocol"]
+
+        mask = category_mask(column, selected)
+
+        np.testing.assert_array_equal(mask, column.isin(selected).to_numpy())
+
+    def test_category_mask_all_selected_returns_none(self):
+        """Test selecting every category without missing values skips filtering."""
+        column = _events_frame()["outcome"]
+
+        assert category_mask(column, list(dashboard.OUTCOMES)) is None
+
+    def test_filter_events(self):
+        """Test events are filtered by protocol and outcome and capped."""
+        events_df = _events_frame()
+        expected = events_df[
+            events_df["protocol"].isin(["MCP", "A2A"])
+            & events_df["outcome"].isin(["success", "error"])
+        ]
+
+        filtered = filter_events(events_df, ["MCP", "A2A"], ["success", "error"], 3)
+
+        pd.testing.assert_frame_equal(filtered, expected.head(3))
+
+
+class TestGetAuditFrame:
+    """Tests for the cached audit event table."""
+
+    def test_get_audit_frame_rebuilds_on_version_change(self, session_state):
+        """Test the table is reused until audit_version changes."""
+        dashboard.add_audit_event("MCP", "agent-1", "database/prod", "success")
+        session_state.audit_version += 1
+        first = dashboard.get_audit_frame()
+
+        assert dashboard.get_audit_frame() is first
+
+        dashboard.add_audit_event("A2A", "agent-2", "database/prod", "error")
+        session_state.audit_version += 1
+        rebuilt = dashboard.get_audit_frame()
+
+        assert rebuilt is not first
+        assert rebuilt["agent_id"].tolist() == ["agent-2", "agent-1"]
+
+    def test_get_audit_frame_rebuilds_on_column_reset(self, session_state):
+        """Test replacing the audit columns invalidates the table."""
+        dashboard.add_audit_event("MCP", "agent-1", "database/prod", "success")
+        first = dashboard.get_audit_frame()
+
+        session_state.audit_columns = new_audit_columns()
+
+        assert dashboard.get_audit_frame() is not first
+        assert dashboard.get_audit_frame().empty
+
+
+class TestActiveTokens:
+    """Tests for the active tokens heap."""
+
+    def test_sorted_active_tokens_orders_by_expiry_then_insertion(self, session_state):
+        """Test tokens sort by expires_at, with ties kept in insertion order."""
+        now = time.time()
+        for name, offset in [("c", 300), ("a1", 100), ("b", 200), ("a2", 100)]:
+            dashboard.add_active_token({"token": name, "expires_at": now + offset})
+
+        tokens = [info["token"] for info in dashboard.sorted_active_tokens()]
+
+        assert tokens == ["a1", "a2", "b", "c"]
+
+    def test_clean_expired_tokens_pops_only_expired(self, session_state):
+        """Test expired tokens are popped, soonest first, including ties."""
+        now = time.time()
+        for name, offset in [("live", 60), ("old1", -10), ("old2", -10), ("older", -60)]:
+            dashboard.add_active_token({"token": name, "expires_at": now + offset})
+
+        dashboard.clean_expired_tokens()
+
+        assert [info["token"] for info in dashboard.sorted_active_tokens()] == ["live"]
+
+    def test_get_times_remaining(self):
+        """Test remaining times are formatted, with past expiries as Expired."""
+        now = time.time()
+
+        remaining = get_times_remaining([now + 125.5, now - 1, now + 59.5])
+
+        assert remaining == ["2m 5s", "Expired", "0m 59s"]
+
+
+class TestBuildAuditFrame:
+    """Tests for building the audit event table."""
+
+    def test_build_audit_frame_parses_mixed_timestamps(self):
+        """Test one naive or nanosecond timestamp does not fail the batch."""
+        audit_columns = new_audit_columns()
+        timestamps = [
+            "2024-01-01T00:00:00Z",
+            "2024-01-01T01:00:00",
+            "2024-01-01T02:00:00.123456789+00:00",
+            "not-a-timestamp",
+        ]
+        for timestamp in timestamps:
+            audit_columns["timestamp"].append(timestamp)
+            audit_columns["protocol"].append("MCP")
+            audit_columns["agent_id"].append("agent-1")
+            audit_columns["resource"].append("database/prod")
+            audit_columns["outcome"].append("success")
+            audit_columns["metadata"].append("{}")
+
+        events_df = build_audit_frame(audit_columns)
+
+        assert events_df["timestamp"].tolist()[:3] == [
+            pd.Timestamp("2024-01-01T00:00:00Z"),
+            pd.Timestamp("2024-01-01T01:00:00Z"),
+            pd.Timestamp("2024-01-01T02:00:00.123456Z"),
+        ]
+        assert events_df["timestamp"].isna().tolist() == [False, False, False, True]
+
+
+class TestEncodeCsv:
+    """Tests for audit event CSV export."""
+
+    def test_encode_csv_matches_to_csv_with_missing_values(self):
+        """Test missing values are written as empty fields, like to_csv."""
+        events_df = pd.DataFrame(
+            {
+                "timestamp": pd.to_datetime(["2024-01-01T12:30:00Z", None], utc=True),
+                "protocol": pd.Series(["MCP", None], dtype="category"),
+                "agent_id": pd.Series(["agent-1", pd.NA], dtype="string[pyarrow]"),
+                "resource": pd.Series([None, "database/prod"], dtype="string[pyarrow]"),
+                "outcome": pd.Series(["success", "error"], dtype="category"),
+            }
+        )
+
+        expected = events_df.to_csv(index=False, date_format="%Y-%m-%d %H:%M:%S")
+
+        assert encode_csv(events_df) == expected.encode()